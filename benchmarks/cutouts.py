@@ -0,0 +1,88 @@
+"""Compare cutting the wall openings one by one against one fused cut.
+
+Run from the repository root:
+
+    python benchmarks/cutouts.py [--extra 0 20 80] [--repeat 3]
+
+``--extra`` adds that many small round holes spread over the front and back
+walls on top of the real connector openings, to see how both approaches scale.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from build123d import *
+
+from gbs_case.cutouts import case_cutouts, circle, cutout_tools
+from gbs_case.parameters import Parameters
+from gbs_case.parts import case_wall_planes, pcb_location_from_case_wall_inner_face
+from gbs_case.selectors import FaceIndex
+
+
+def extra_cutouts(params: Parameters, count: int):
+    """``count`` holes in a grid on the upper part of the front and back walls."""
+    columns = 20
+    pitch = params.pcb.width * 0.8 / columns
+    cutouts = []
+    for i in range(count):
+        wall = "front" if i % 2 == 0 else "back"
+        row, column = divmod(i // 2, columns)
+        position = Vector((column - (columns - 1) / 2) * pitch, 28 + row * pitch)
+        cutouts.append(circle("extra", wall, position, pitch / 2))
+    return cutouts
+
+
+def shell(params: Parameters) -> Part:
+    with BuildPart() as shell_bp:
+        Box(params.case_outer_width, params.case_outer_length, params.case_outer_height)
+        offset(amount=-params.case_shell_thickness, openings=shell_bp.faces().sort_by(Axis.Z)[-1])
+    return shell_bp.part
+
+
+def per_feature(part: Part, tools) -> Part:
+    for tool in tools:
+        part = part.cut(tool)
+    return part
+
+
+def fused(part: Part, tools) -> Part:
+    return part.cut(*tools)
+
+
+def timed(function, *args, repeat: int):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--extra", type=int, nargs="+", default=[0, 20, 80])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    params = Parameters()
+    case = shell(params)
+    planes = case_wall_planes(FaceIndex(case.faces()))
+    origin = pcb_location_from_case_wall_inner_face(params)
+
+    print(f"{'cutouts':>8} {'per feature':>12} {'fused':>8} {'speedup':>8}")
+    for extra in args.extra:
+        cutouts = case_cutouts(params) + extra_cutouts(params, extra)
+        tools = cutout_tools(cutouts, planes, origin, params.case_shell_thickness)
+        one_by_one, expected = timed(per_feature, case, tools, repeat=args.repeat)
+        at_once, result = timed(fused, case, tools, repeat=args.repeat)
+        assert abs(expected.volume - result.volume) < 1e-6 * expected.volume
+        print(f"{len(cutouts):>8} {one_by_one:>11.3f}s {at_once:>7.3f}s {one_by_one / at_once:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Time the part builds, the assembly and the STL export against a baseline.
+
+Run from the repository root:
+
+    python benchmarks/suite.py --save benchmarks/baseline.json   # record a baseline
+    python benchmarks/suite.py                                   # compare with it
+
+Without a baseline, the first run records one. Baselines depend on the
+machine, so they aren't committed.
+
+Every iteration of every benchmark runs in a fresh Python process, so imports,
+OCP's state and the feature graphs' memos don't carry over from one iteration
+to the next. Importing build123d isn't part of the measured time.
+
+Besides the times, each benchmark records a fingerprint of what it produced
+(volume, area and face count of the parts, the triangle count of the STL), so
+that a faster build that makes different geometry doesn't go unnoticed. The
+suite exits with status 1 when a median is more than ``--threshold`` slower
+than the baseline's, or when a fingerprint differs.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gbs_case.parameters import Parameters
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# Sets up a benchmark and returns the function to time, and the function
+# that makes a fingerprint of its result.
+Benchmark = Callable[[], Tuple[Callable[[], object], Callable[[object], dict]]]
+
+
+def part_fingerprint(part) -> dict:
+    return {
+        "volume": round(part.volume, 3),
+        "area": round(part.area, 3),
+        "faces": len(part.faces()),
+    }
+
+
+def _part(name: str, params: Parameters) -> Benchmark:
+    def setup():
+        from gbs_case.parts import PART_BUILDERS
+
+        return lambda: PART_BUILDERS[name](params), part_fingerprint
+
+    return setup
+
+
+def _assembly():
+    from gbs_case.parts import PART_BUILDERS, connect_parts
+
+    params = Parameters()
+    parts = {name: builder(params) for name, builder in PART_BUILDERS.items()}
+
+    def connect():
+        connect_parts(parts)
+        return parts
+
+    def fingerprint(parts) -> dict:
+        return {
+            name: [round(value, 3) for value in part.location.position]
+            for name, part in parts.items()
+        }
+
+    return connect, fingerprint
+
+
+def _export():
+    from gbs_case.export import write_stl
+    from gbs_case.parts import build_case
+
+    part = build_case(Parameters())
+    path = Path(tempfile.mkdtemp()) / "case.stl"
+
+    def export():
+        write_stl(part.wrapped, path)
+        return path
+
+    def fingerprint(path: Path) -> dict:
+        # Binary STL: 80 byte header, triangle count, 50 bytes per triangle.
+        return {"triangles": (path.stat().st_size - 84) // 50}
+
+    return export, fingerprint
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    "pcb": _part("pcb", Parameters()),
+    "hdmi_holder": _part("hdmi_holder", Parameters()),
+    "case": _part("case", Parameters()),
+    "case_nob": _part("case", Parameters(use_nob=True)),
+    "top_cover": _part("top_cover", Parameters()),
+    "top_cover_nob": _part("top_cover", Parameters(use_nob=True)),
+    "assembly": _assembly,
+    "export_stl": _export,
+}
+
+
+def run_once(name: str) -> dict:
+    """One iteration, in this process."""
+    import build123d  # noqa: F401, imported before the clock starts
+
+    function, fingerprint = BENCHMARKS[name]()
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    return {"seconds": seconds, "fingerprint": fingerprint(result)}
+
+
+def run(name: str, repeat: int) -> dict:
+    """``repeat`` iterations, each in a fresh process."""
+    times = []
+    fingerprints = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, __file__, "--iteration", name],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        iteration = json.loads(output.splitlines()[-1])
+        times.append(iteration["seconds"])
+        fingerprints.append(iteration["fingerprint"])
+    if any(fingerprint != fingerprints[0] for fingerprint in fingerprints):
+        raise RuntimeError(f"{name} made different geometry in different runs: {fingerprints}")
+    return {"median": statistics.median(times), "times": times, "fingerprint": fingerprints[0]}
+
+
+def environment() -> dict:
+    from importlib.metadata import version
+
+    import OCP
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "build123d": version("build123d"),
+        "OCP": OCP.__version__,
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float, noise: float) -> bool:
+    """Print the comparison, and return whether everything passed."""
+    passed = True
+    print(f"{'benchmark':<14} {'baseline':>9} {'median':>9} {'change':>8}  status")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<14} {'':>9} {result['median']:>8.3f}s {'':>8}  new")
+            continue
+        before = baseline[name]["median"]
+        change = result["median"] / before - 1
+        status = "ok"
+        if result["fingerprint"] != baseline[name]["fingerprint"]:
+            status = f"GEOMETRY CHANGED {baseline[name]['fingerprint']} -> {result['fingerprint']}"
+            passed = False
+        elif change > threshold and result["median"] - before > noise:
+            status = "SLOWER"
+            passed = False
+        print(f"{name:<14} {before:>8.3f}s {result['median']:>8.3f}s {change:>+7.0%}  {status}")
+    return passed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "benchmarks", nargs="*", metavar="BENCHMARK", help=f"any of {', '.join(BENCHMARKS)}, all by default",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="iterations, each in a fresh process")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="baseline to compare with")
+    parser.add_argument("--save", type=Path, help="write the results as a baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2,
+        help="fail when a median is this much slower than the baseline's, 0.2 for 20%%",
+    )
+    parser.add_argument(
+        "--noise", type=float, default=0.02,
+        help="seconds a median may grow by regardless of the threshold, for the very quick benchmarks",
+    )
+    parser.add_argument("--iteration", choices=BENCHMARKS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.iteration is not None:
+        print(json.dumps(run_once(args.iteration)))
+        return 0
+
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results = {}
+    for name in args.benchmarks or BENCHMARKS:
+        results[name] = run(name, args.repeat)
+        print(f"{name:<14} {results[name]['median']:>8.3f}s  {results[name]['fingerprint']}", file=sys.stderr)
+
+    if args.save is not None or not args.baseline.exists():
+        path = args.baseline if args.save is None else args.save
+        if args.save is None:
+            print(f"No baseline at {path}, recording this run as the baseline", file=sys.stderr)
+        path.write_text(json.dumps({"environment": environment(), "results": results}, indent=2) + "\n")
+        print(path)
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    if baseline["environment"] != environment():
+        print(f"The baseline was recorded with {baseline['environment']}", file=sys.stderr)
+    return 0 if compare(results, baseline["results"], args.threshold, args.noise) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
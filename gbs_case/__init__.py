@@ -0,0 +1,23 @@
+"""Parametric 3D printable case for a GBS-8200 video converter board.
+
+The parts are built with build123d. Importing this package only brings in the
+parameters and the part factories of :mod:`gbs_case.factory`, which import
+build123d on their first build; the builders live in :mod:`gbs_case.parts`.
+"""
+
+from .factory import build_assembly, build_case, build_hdmi_holder, build_pcb, build_top_cover
+from .parameters import ClearanceGap, Hdmi, M3, Parameters, Pcb, VentPattern
+
+__all__ = [
+    "ClearanceGap",
+    "Hdmi",
+    "M3",
+    "Parameters",
+    "Pcb",
+    "VentPattern",
+    "build_assembly",
+    "build_case",
+    "build_hdmi_holder",
+    "build_pcb",
+    "build_top_cover",
+]
@@ -0,0 +1,69 @@
+"""Serialization of parts, joints included, to BREP."""
+
+from io import BytesIO
+from typing import Any, Dict, List, Tuple
+
+from build123d import Color, Location, Part, RigidJoint
+from OCP.BRep import BRep_Builder
+from OCP.BRepTools import BRepTools
+from OCP.gp import gp_Trsf
+from OCP.TopoDS import TopoDS_Shape
+
+
+def location_to_list(location: Location) -> List[float]:
+    """The 3x4 transformation matrix of the location, row by row."""
+    trsf = location.wrapped.Transformation()
+    return [trsf.Value(row, col) for row in range(1, 4) for col in range(1, 5)]
+
+
+def location_from_list(values: List[float]) -> Location:
+    trsf = gp_Trsf()
+    trsf.SetValues(*values)
+    return Location(trsf)
+
+
+def part_to_brep(part: Part) -> Tuple[bytes, Dict[str, Any]]:
+    """Split the part into BREP data and the metadata BREP can't hold.
+
+    The metadata is plain JSON compatible data: label, color and joints.
+    """
+    buffer = BytesIO()
+    BRepTools.Write_s(part.wrapped, buffer)
+    meta = {
+        "label": part.label,
+        "color": list(part.color) if part.color is not None else None,
+        "joints": [
+            {
+                "label": label,
+                "location": location_to_list(joint.relative_location),
+            }
+            for label, joint in part.joints.items()
+            if isinstance(joint, RigidJoint)
+        ],
+    }
+    return buffer.getvalue(), meta
+
+
+def part_from_brep(data: bytes, meta: Dict[str, Any]) -> Part:
+    """Inverse of :func:`part_to_brep`."""
+    shape = TopoDS_Shape()
+    try:
+        BRepTools.Read_s(shape, BytesIO(data), BRep_Builder())
+    except Exception as error:
+        # OCCT's exceptions, like Standard_ConstructionError for a truncated
+        # file, don't share a Python base class.
+        raise ValueError(f"Could not read BREP data of {meta['label']}") from error
+    if shape.IsNull():
+        raise ValueError(f"Could not read BREP data of {meta['label']}")
+
+    part = Part(shape)
+    part.label = meta["label"]
+    if meta["color"] is not None:
+        part.color = Color(*meta["color"])
+    for joint in meta["joints"]:
+        RigidJoint(
+            label=joint["label"],
+            to_part=part,
+            joint_location=part.location * location_from_list(joint["location"]),
+        )
+    return part
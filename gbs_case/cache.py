@@ -0,0 +1,233 @@
+"""Content addressed on-disk cache of built parts.
+
+A part is looked up by a hash of everything it is built from: the part's
+parameters (see :data:`~gbs_case.parameters.PART_INPUTS`), the source of its
+builder function and of the modules shared by all builders (the helpers, and
+the parameters with their derived values), and the versions of build123d and
+OCP. Entries are stored as a BREP file with a JSON sidecar for the joints
+and the hash of the BREP data, and the least recently used entries are
+evicted once the cache grows beyond ``max_size`` bytes. An entry whose BREP
+file doesn't match its hash, or can't be read, is removed and built again.
+"""
+
+import ast
+import dataclasses
+import hashlib
+import json
+import os
+from functools import lru_cache
+from importlib.metadata import version
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Set, Tuple, Union
+
+from .files import atomic_write, evict
+from .parameters import Parameters
+
+if TYPE_CHECKING:
+    from build123d import Part
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "gbs_case"
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+
+
+# Modules the builders import that can't change the geometry.
+_UNHASHED_MODULES = ("profiling.py",)
+
+
+def _helper_modules(directory: Path) -> Dict[str, Set[str]]:
+    """Modules of the package that parts.py imports, directly or through each other.
+
+    Maps each module to the names imported from it. Only the module level
+    imports count: that is where the builders' helpers and the parameters'
+    derived values come from.
+    """
+    found: Dict[str, Set[str]] = {}
+    pending = ["parts.py"]
+    while pending:
+        tree = ast.parse((directory / pending.pop()).read_text())
+        for node in tree.body:
+            if not isinstance(node, ast.ImportFrom) or node.level != 1:
+                continue
+            if node.module:
+                imports = [(node.module, {alias.name for alias in node.names})]
+            else:
+                imports = [(alias.name, set()) for alias in node.names]
+            for name, names in imports:
+                module = f"{name}.py"
+                if module == "parts.py" or module in _UNHASHED_MODULES or not (directory / module).exists():
+                    continue
+                if module not in found:
+                    found[module] = set()
+                    pending.append(module)
+                found[module] |= names
+    return found
+
+
+def _parameters_source(text: str, imported: Set[str]) -> str:
+    """The part of parameters.py that the builders depend on besides the parameters' values.
+
+    The values, field defaults included, are in the key already (see
+    :meth:`~gbs_case.parameters.Parameters.inputs_of`), so only a change in
+    a part's own inputs rebuilds it. What is left are the derived
+    dimensions, the checks and :data:`~gbs_case.parameters.PART_INPUTS`,
+    and the other definitions the builders import, like ``AudioJack``.
+    """
+    tree = ast.parse(text)
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+    # Parameters and the classes of its fields hold values, keep their methods.
+    value_classes = {"Parameters"} | {
+        name.id
+        for node in classes["Parameters"].body if isinstance(node, ast.AnnAssign)
+        for name in ast.walk(node.annotation) if isinstance(name, ast.Name) and name.id in classes
+    }
+    sources = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name in value_classes:
+            sources.append(f"class {node.name}:")
+            sources += [ast.get_source_segment(text, item) for item in node.body if isinstance(item, ast.FunctionDef)]
+            continue
+        targets = [node.name] if isinstance(node, (ast.ClassDef, ast.FunctionDef)) else [
+            target.id
+            for target in (node.targets if isinstance(node, ast.Assign) else [getattr(node, "target", None)])
+            if isinstance(target, ast.Name)
+        ]
+        if any(target in imported or target in ("PART_INPUTS", "_ALL_FIELDS") for target in targets):
+            sources.append(ast.get_source_segment(text, node))
+    return "\n".join(sources)
+
+
+@lru_cache(maxsize=None)
+def _builder_sources() -> Dict[str, str]:
+    """Source each part is built from.
+
+    That is the part's own ``build_*`` function, plus the rest of parts.py
+    and the helper modules, which all the builders share. Read with ast
+    rather than inspect, so that computing a key doesn't import build123d.
+    """
+    directory = Path(__file__).parent
+    text = (directory / "parts.py").read_text()
+    builders = {
+        node.name[len("build_"):]: ast.get_source_segment(text, node)
+        for node in ast.parse(text).body
+        if isinstance(node, ast.FunctionDef) and node.name.startswith("build_")
+    }
+    shared = text
+    for source in builders.values():
+        shared = shared.replace(source, "")
+    for module, imported in sorted(_helper_modules(directory).items()):
+        source = (directory / module).read_text()
+        shared += _parameters_source(source, imported) if module == "parameters.py" else source
+    return {name: source + shared for name, source in builders.items()}
+
+
+def canonical(value: Any) -> Any:
+    """JSON compatible form of parameter values, in which 4 and 4.0 are equal."""
+    if dataclasses.is_dataclass(value):
+        value = {f.name: getattr(value, f.name) for f in dataclasses.fields(value)}
+    if isinstance(value, dict):
+        return {name: canonical(v) for name, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [canonical(v) for v in value]
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+@lru_cache(maxsize=None)
+def _versions() -> Tuple[str, str]:
+    import OCP
+
+    return version("build123d"), OCP.__version__
+
+
+class PartCache:
+    def __init__(
+        self,
+        directory: Union[str, os.PathLike, None] = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+    ):
+        self.directory = Path(os.environ.get("GBS_CASE_CACHE_DIR", DEFAULT_CACHE_DIR) if directory is None else directory)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, name: str, params: Parameters) -> str:
+        inputs = {
+            "part": name,
+            "builder": _builder_sources()[name],
+            "inputs": canonical(params.inputs_of(name)),
+            "versions": _versions(),
+        }
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+    def _paths(self, key: str):
+        return self.directory / f"{key}.brep", self.directory / f"{key}.json"
+
+    def lookup(self, name: str, params: Parameters) -> Optional[Path]:
+        """Path of the cached BREP file of the part, if there is one.
+
+        Doesn't need build123d, the file can be read with OCP alone.
+        """
+        brep_path, meta_path = self._paths(self.key(name, params))
+        try:
+            # Mark as recently used for the eviction.
+            os.utime(meta_path)
+            os.utime(brep_path)
+        except OSError:
+            return None
+        return brep_path
+
+    def get(self, key: str) -> Optional["Part"]:
+        from .brep import part_from_brep
+
+        brep_path, meta_path = self._paths(key)
+        try:
+            data = brep_path.read_bytes()
+            meta = json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            return None
+        try:
+            # OCCT can loop forever on a truncated file, so check it before reading.
+            if meta.get("sha256") != hashlib.sha256(data).hexdigest():
+                raise ValueError(f"Corrupt BREP file {brep_path}")
+            part = part_from_brep(data, meta)
+        except (ValueError, KeyError):
+            # Build it again.
+            for path in (meta_path, brep_path):
+                path.unlink(missing_ok=True)
+            return None
+        # Mark as recently used for the eviction.
+        os.utime(brep_path)
+        os.utime(meta_path)
+        return part
+
+    def put(self, key: str, part: "Part"):
+        from .brep import part_to_brep
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        brep_path, meta_path = self._paths(key)
+        data, meta = part_to_brep(part)
+        meta["sha256"] = hashlib.sha256(data).hexdigest()
+        # The sidecar goes last, so an entry is never seen half written.
+        atomic_write(brep_path, data)
+        atomic_write(meta_path, json.dumps(meta))
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in ``max_size``."""
+        entries = ([meta_path, meta_path.with_suffix(".brep")] for meta_path in self.directory.glob("*.json"))
+        evict(entries, self.max_size)
+
+    def build(self, name: str, params: Parameters) -> "Part":
+        """Load the part from the cache, or build it and store it."""
+        from .parts import PART_BUILDERS
+
+        key = self.key(name, params)
+        part = self.get(key)
+        if part is not None:
+            self.hits += 1
+            return part
+        self.misses += 1
+        part = PART_BUILDERS[name](params)
+        self.put(key, part)
+        return part
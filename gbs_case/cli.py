@@ -0,0 +1,436 @@
+"""Command line interface, run with ``python -m gbs_case``.
+
+Nothing here imports ocp_vscode, so the commands work on machines without a
+viewer. build123d is only imported once a command needs it.
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from .parameters import FILAMENTS, MESH_PRESETS, PRINTABLE_PARTS, Parameters
+
+_start = time.perf_counter()
+
+
+def _log_time(args: argparse.Namespace, what: str, since: float) -> float:
+    now = time.perf_counter()
+    if args.timings:
+        print(f"{what}: {now - since:.3f} s")
+    return now
+
+
+def _log_export(args: argparse.Namespace, path: Path, seconds: float):
+    if args.timings:
+        size = path.stat().st_size
+        triangles = f", {(size - 84) // 50} triangles" if path.suffix == ".stl" else ""
+        print(f"export {path}: {seconds:.3f} s, {size} bytes{triangles}")
+
+
+def _log_features(args: argparse.Namespace):
+    """Which features were reused and computed, for the parts built in this process."""
+    if args.timings or args.profile is not None:
+        from .parts import feature_report
+
+        for line in feature_report():
+            print(line)
+
+
+def _cache(args: argparse.Namespace):
+    if args.no_cache:
+        return None
+    from .cache import PartCache
+
+    return PartCache(args.cache_dir)
+
+
+def _write_files(args: argparse.Namespace, shapes: dict, breps: dict):
+    """Write the files whose parts changed since the last export to the same directory.
+
+    ``shapes`` are the parts' OCP shapes, ``breps`` their BREP data or files
+    for the worker processes.
+    """
+    from .factory import build_assembly
+    from .files import temporary_path
+    from .manifest import ExportManifest, mesh_settings, shape_fingerprint
+
+    manifest = ExportManifest(args.out, force=args.force)
+    paths = {name: args.out / f"{name}.stl" for name in shapes}
+    settings = mesh_settings("stl", args.preset)
+    fingerprints = {name: shape_fingerprint(shape) for name, shape in shapes.items()}
+    stale = [name for name in shapes if not manifest.is_current(paths[name], fingerprints[name], settings)]
+    manifest.unchanged += [paths[name] for name in shapes if name not in stale]
+
+    if args.jobs != 1 and len(stale) > 1:
+        from .parallel import export_stls
+
+        temporaries = {name: temporary_path(paths[name]) for name in stale}
+        results = export_stls({temporaries[name]: breps[name] for name in stale}, args.jobs, args.preset)
+        for name in stale:
+            os.replace(temporaries[name], paths[name])
+            manifest.record(paths[name], fingerprints[name], settings)
+            _log_export(args, paths[name], results[temporaries[name]][1])
+    else:
+        for name in stale:
+            start = time.perf_counter()
+            manifest.stl(paths[name], shapes[name], args.preset)
+            _log_export(args, paths[name], time.perf_counter() - start)
+
+    if args.three_mf is not None:
+        start = time.perf_counter()
+        if manifest.three_mf(args.three_mf, shapes, args.preset):
+            _log_export(args, args.three_mf, time.perf_counter() - start)
+    if args.step is not None:
+        start = time.perf_counter()
+        if manifest.step(args.step, build_assembly(Parameters(use_nob=args.use_nob), _cache(args))):
+            _log_export(args, args.step, time.perf_counter() - start)
+    manifest.save()
+
+    for path in manifest.written:
+        print(path)
+    for path in manifest.unchanged:
+        print(f"{path} (unchanged)")
+
+
+def export(args: argparse.Namespace) -> int:
+    now = _log_time(args, "startup", _start)
+
+    params = Parameters(use_nob=args.use_nob)
+    args.out.mkdir(parents=True, exist_ok=True)
+
+    cache = _cache(args)
+    if cache is not None:
+        cached = {name: cache.lookup(name, params) for name in args.parts}
+        if all(cached.values()) and args.profile is None and args.step is None:
+            # Everything is in the cache, build123d isn't needed at all.
+            from .export import read_brep
+
+            now = _log_time(args, "import OCP", now)
+            _write_files(args, {name: read_brep(cached[name]) for name in args.parts}, cached)
+            return 0
+
+    # Imported here, so that its time isn't counted in the first build.
+    import build123d
+
+    from .factory import build_part
+
+    now = _log_time(args, "import build123d", now)
+
+    if args.profile is not None:
+        from .profiling import Profiler, span
+
+        args.jobs = 1
+        with Profiler() as profiler:
+            parts = {}
+            for name in args.parts:
+                with span(f"build {name}", "part"):
+                    parts[name] = build_part(name, params, cache)
+            with span("export", "export"):
+                _write_files(args, {name: part.wrapped for name, part in parts.items()}, {})
+        profiler.write_trace(args.profile)
+        print(profiler.summary())
+        _log_features(args)
+        print(args.profile)
+        return 0
+
+    if args.jobs != 1:
+        from .parallel import build_parts
+
+        parts = build_parts(args.parts, params, cache, args.jobs)
+        now = _log_time(args, "build", now)
+    else:
+        parts = {}
+        for name in args.parts:
+            parts[name] = build_part(name, params, cache)
+            now = _log_time(args, f"build {name}", now)
+        _log_features(args)
+
+    from .brep import part_to_brep
+
+    breps = {name: part_to_brep(part)[0] for name, part in parts.items()} if args.jobs != 1 else {}
+    _write_files(args, {name: part.wrapped for name, part in parts.items()}, breps)
+    return 0
+
+
+def presets(args: argparse.Namespace) -> int:
+    from .export import write_stl
+    from .factory import build_part
+    from .parameters import MESH_PRESETS
+
+    params = Parameters(use_nob=args.use_nob)
+    cache = _cache(args)
+    parts = {name: build_part(name, params, cache) for name in args.parts}
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    print(f"{'preset':<8} {'part':<12} {'triangles':>10} {'bytes':>10} {'seconds':>8}")
+    for preset in MESH_PRESETS:
+        for name, part in parts.items():
+            path = args.out / f"{name}_{preset}.stl"
+            start = time.perf_counter()
+            triangles = write_stl(part.wrapped, path, preset)
+            seconds = time.perf_counter() - start
+            print(f"{preset:<8} {name:<12} {triangles:>10} {path.stat().st_size:>10} {seconds:>8.3f}")
+    return 0
+
+
+def _grid(args: argparse.Namespace, base: Parameters) -> dict:
+    from .sweep import parse_value
+
+    grid = {}
+    if args.grid_file is not None:
+        grid.update(json.loads(args.grid_file.read_text()))
+    for assignment in args.grid:
+        name, _, values = assignment.partition("=")
+        grid[name] = values.split(",")
+    return {
+        name: [parse_value(base, name, value) if isinstance(value, str) else value for value in values]
+        for name, values in grid.items()
+    }
+
+
+def sweep(args: argparse.Namespace) -> int:
+    from .cache import PartCache
+    from .sweep import run
+
+    base = Parameters(use_nob=args.use_nob)
+    grid = _grid(args, base)
+
+    rows = run(grid, args.out, args.parts, PartCache(args.cache_dir), args.jobs, base, lean=args.lean)
+    for row in rows:
+        memory = f" {row['peak_rss_mb']:>8.1f} MB peak" if "peak_rss_mb" in row else ""
+        print(f"{row['variant']:<50} {row['part']:<12} {row['status']:<8} {row.get('build_seconds', '')}{memory}")
+    print(args.out / "summary.csv")
+    return 0
+
+
+def properties(args: argparse.Namespace) -> int:
+    from .cache import PartCache
+    from .properties import variant_properties, write_csv
+
+    base = Parameters(use_nob=args.use_nob)
+    rows = variant_properties(
+        _grid(args, base), args.parts, FILAMENTS[args.material], PartCache(args.cache_dir), jobs=args.jobs, base=base,
+    )
+    print(f"{'variant':<40} {'part':<12} {'volume mm³':>12} {'area mm²':>10} {'size mm':>22} {args.material + ' g':>8}")
+    for row in rows:
+        if row["status"] != "ok":
+            print(f"{row['variant']:<40} {row['part']:<12} {row['status']}")
+            continue
+        size = f"{row['size_x']:.1f} x {row['size_y']:.1f} x {row['size_z']:.1f}"
+        print(
+            f"{row['variant']:<40} {row['part']:<12} {row['volume']:>12.1f} {row['area']:>10.1f} {size:>22} "
+            f"{row['filament_grams']:>8.1f}"
+        )
+    if args.json is not None:
+        args.json.write_text(json.dumps(rows, indent=2) + "\n")
+        print(args.json)
+    if args.csv is not None:
+        write_csv(rows, args.csv)
+        print(args.csv)
+    return 0
+
+
+def layout(args: argparse.Namespace) -> int:
+    from .export import write_3mf
+    from .factory import build_part
+    from .layout import plate_transforms
+
+    beds = []
+    for bed in args.bed or ["256x256"]:
+        try:
+            width, depth = (float(value) for value in bed.lower().split("x"))
+        except ValueError:
+            raise SystemExit(f"--bed must be WIDTHxDEPTH in mm, like 256x256, not {bed!r}")
+        beds.append((bed, (width, depth)))
+
+    params = Parameters(use_nob=args.use_nob)
+    cache = _cache(args)
+    shapes = {name: build_part(name, params, cache).wrapped for name in args.parts}
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    status = 0
+    for label, bed in beds:
+        try:
+            plates = plate_transforms(shapes, args.copies, bed, args.spacing)
+        except ValueError as error:
+            print(f"{label}: {error}")
+            status = 1
+            continue
+        for number, items in enumerate(plates, start=1):
+            path = args.out / f"plate_{label}_{number}.3mf"
+            write_3mf(shapes, path, args.preset, items)
+            print(f"{path}: {len(items)} parts")
+    return status
+
+
+def check(args: argparse.Namespace) -> int:
+    from .factory import build_part
+    from .interference import check_fits, check_pairs, check_ports, report
+    from .parts import PART_BUILDERS, connect_parts
+
+    params = Parameters(use_nob=args.use_nob)
+    cache = _cache(args)
+    parts = {name: build_part(name, params, cache) for name in PART_BUILDERS}
+    connect_parts(parts)
+
+    pairs = check_pairs(parts, args.margin)
+    fits = check_fits(parts)
+    ports = check_ports(params, parts)
+    print(*report("parts", pairs), *report("fits", fits), *report("ports", ports), sep="\n")
+
+    failed = [clearance for clearance in pairs + fits if clearance.status == "interference"]
+    failed += [
+        clearance for clearance in fits
+        if clearance.status != "clear" or clearance.distance < args.min_fit_clearance
+    ]
+    return 1 if failed else 0
+
+
+def watch(args: argparse.Namespace) -> int:
+    from .watch import watch as watch_script
+
+    try:
+        watch_script(args.script, args.interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m gbs_case", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="build the printable parts and write them as STL")
+    export_parser.add_argument("--out", type=Path, default=Path("."), help="output directory")
+    export_parser.add_argument("--parts", nargs="+", choices=PRINTABLE_PARTS, default=list(PRINTABLE_PARTS))
+    export_parser.add_argument("--use-nob", action="store_true", help="add the snap nobs for the top cover")
+    export_parser.add_argument("--cache-dir", type=Path, default=None)
+    export_parser.add_argument("--no-cache", action="store_true", help="always rebuild the parts")
+    export_parser.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="build and export in this many worker processes, 0 for one per part",
+    )
+    export_parser.add_argument(
+        "--preset", choices=MESH_PRESETS, default="print", help="how finely to mesh the parts (default: print)",
+    )
+    export_parser.add_argument(
+        "--3mf", dest="three_mf", type=Path, metavar="FILE", help="also write all the parts into one 3MF file",
+    )
+    export_parser.add_argument(
+        "--step", type=Path, metavar="FILE",
+        help="also write the whole assembly, with the pcb and the parts' labels and colors, as STEP",
+    )
+    export_parser.add_argument(
+        "--force", action="store_true", help="write every file, also those whose parts didn't change",
+    )
+    export_parser.add_argument(
+        "--timings", action="store_true", help="print how long each step takes, and the size of each file",
+    )
+    export_parser.add_argument(
+        "--profile", type=Path, metavar="TRACE.json",
+        help="build in this process with every builder and operation profiled, and write a Chrome trace; "
+        "combine with --no-cache to profile every part",
+    )
+    export_parser.set_defaults(func=export)
+
+    sweep_parser = commands.add_parser(
+        "sweep", help="build every combination of a grid of parameters, e.g. to tune clearances",
+    )
+    sweep_parser.add_argument(
+        "--grid", action="append", default=[], metavar="NAME=VALUE,...",
+        help="values of one parameter, e.g. top_cover_gap=tight,standard,loose or pcb.thickness=1.6,1.68",
+    )
+    sweep_parser.add_argument("--grid-file", type=Path, help="JSON object of parameter names to lists of values")
+    sweep_parser.add_argument("--out", type=Path, default=Path("sweep"), help="output directory")
+    sweep_parser.add_argument("--parts", nargs="+", choices=PRINTABLE_PARTS, default=list(PRINTABLE_PARTS))
+    sweep_parser.add_argument("--use-nob", action="store_true", help="add the snap nobs for the top cover")
+    sweep_parser.add_argument("--cache-dir", type=Path, default=None)
+    sweep_parser.add_argument("-j", "--jobs", type=int, default=0, help="worker processes, 0 for one per CPU")
+    sweep_parser.add_argument(
+        "--lean", action="store_true",
+        help="keep only the finished parts, release the intermediate results after each one and report its peak memory",
+    )
+    sweep_parser.set_defaults(func=sweep)
+
+    presets_parser = commands.add_parser(
+        "presets", help="export the parts with every mesh preset, and compare the file sizes and times",
+    )
+    presets_parser.add_argument("--out", type=Path, default=Path("presets"), help="output directory")
+    presets_parser.add_argument("--parts", nargs="+", choices=PRINTABLE_PARTS, default=list(PRINTABLE_PARTS))
+    presets_parser.add_argument("--use-nob", action="store_true", help="add the snap nobs for the top cover")
+    presets_parser.add_argument("--cache-dir", type=Path, default=None)
+    presets_parser.add_argument("--no-cache", action="store_true", help="always rebuild the parts")
+    presets_parser.set_defaults(func=presets)
+
+    properties_parser = commands.add_parser(
+        "properties", help="volume, area, center of mass, size and filament use of the parts, for a grid of variants",
+    )
+    properties_parser.add_argument(
+        "--grid", action="append", default=[], metavar="NAME=VALUE,...",
+        help="values of one parameter, as for sweep; without a grid only the default variant",
+    )
+    properties_parser.add_argument("--grid-file", type=Path, help="JSON object of parameter names to lists of values")
+    properties_parser.add_argument("--parts", nargs="+", choices=PRINTABLE_PARTS, default=list(PRINTABLE_PARTS))
+    properties_parser.add_argument("--use-nob", action="store_true", help="add the snap nobs for the top cover")
+    properties_parser.add_argument("--cache-dir", type=Path, default=None)
+    properties_parser.add_argument(
+        "--material", choices=FILAMENTS, default="PLA", help="filament to estimate the weight for (default: PLA)",
+    )
+    properties_parser.add_argument("--json", type=Path, metavar="FILE", help="write the results as JSON")
+    properties_parser.add_argument("--csv", type=Path, metavar="FILE", help="write the results as CSV")
+    properties_parser.add_argument(
+        "-j", "--jobs", type=int, default=0, help="worker processes for the parts to build, 0 for one per CPU",
+    )
+    properties_parser.set_defaults(func=properties)
+
+    layout_parser = commands.add_parser(
+        "layout", help="lay copies of the printable parts flat on build plates, one 3MF file per plate",
+    )
+    layout_parser.add_argument("--out", type=Path, default=Path("plates"), help="output directory")
+    layout_parser.add_argument("--parts", nargs="+", choices=PRINTABLE_PARTS, default=list(PRINTABLE_PARTS))
+    layout_parser.add_argument("--copies", type=int, default=1, help="how many of each part (default: 1)")
+    layout_parser.add_argument(
+        "--bed", action="append", metavar="WIDTHxDEPTH",
+        help="size of the build plate in mm, may be given more than once (default: 256x256)",
+    )
+    layout_parser.add_argument("--spacing", type=float, default=5.0, help="mm between the parts (default: 5)")
+    layout_parser.add_argument("--use-nob", action="store_true", help="add the snap nobs for the top cover")
+    layout_parser.add_argument("--cache-dir", type=Path, default=None)
+    layout_parser.add_argument("--no-cache", action="store_true", help="always rebuild the parts")
+    layout_parser.add_argument(
+        "--preset", choices=MESH_PRESETS, default="print", help="how finely to mesh the parts (default: print)",
+    )
+    layout_parser.set_defaults(func=layout)
+
+    check_parser = commands.add_parser("check", help="check the assembled parts for interference and clearances")
+    check_parser.add_argument("--use-nob", action="store_true", help="add the snap nobs for the top cover")
+    check_parser.add_argument("--cache-dir", type=Path, default=None)
+    check_parser.add_argument("--no-cache", action="store_true", help="always rebuild the parts")
+    check_parser.add_argument(
+        "--margin", type=float, default=5.0,
+        help="pairs of parts whose bounding boxes are farther apart than this are not measured exactly",
+    )
+    check_parser.add_argument(
+        "--min-fit-clearance", type=float, default=0.0,
+        help="fail when a fit, like the top cover's insert, has less clearance than this; touching always fails",
+    )
+    check_parser.set_defaults(func=check)
+
+    watch_parser = commands.add_parser(
+        "watch", help="run a script, then only its changed cells on every save, with build123d kept loaded",
+    )
+    watch_parser.add_argument("script", type=Path, nargs="?", default=Path("model.py"))
+    watch_parser.add_argument(
+        "--interval", type=float, default=0.25, help="seconds between checks for changes (default: 0.25)",
+    )
+    watch_parser.set_defaults(func=watch)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,165 @@
+"""Openings in the case walls for the connectors of the board.
+
+The openings are described as a table of :class:`Cutout` rows. All of them
+are turned into tool solids and cut from the case in a single boolean
+operation, which costs far less than one subtract per opening against the
+whole shell.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from build123d import *
+
+from .parameters import WALLS, Parameters
+
+
+@dataclass(frozen=True)
+class Cutout:
+    """One opening through a wall.
+
+    ``position`` is the center of the opening relative to the center of the
+    PCB's edge next to the wall, in the local coordinates of the wall's inner
+    plane. Circles use ``width`` as their diameter.
+    """
+
+    port: str
+    wall: str
+    position: Tuple[float, float]
+    profile: str  # "rectangle" or "circle"
+    width: float
+    height: float = 0.0
+
+    def __post_init__(self):
+        assert self.wall in WALLS, self.wall
+        assert self.profile in ("rectangle", "circle"), self.profile
+
+    def bounds(self, origin: Vector) -> Tuple[float, float, float, float]:
+        """2D bounding box of the opening on the wall's plane."""
+        x, y = self.position[0] + origin.X, self.position[1] + origin.Y
+        return x - self.width / 2, y - self.height / 2, x + self.width / 2, y + self.height / 2
+
+    def face(self, plane: Plane, origin: Vector) -> Face:
+        """The outline of the opening on the wall's plane."""
+        # Plain faces rather than sketch objects, so that the tools can be
+        # made inside the case's BuildPart without being added to it.
+        if self.profile == "circle":
+            outline = Face(Wire([Edge.make_circle(self.width / 2)]))
+        else:
+            outline = Face.make_rect(self.width, self.height)
+        return plane * Pos(Vector(*self.position) + origin) * outline
+
+    def tool(self, plane: Plane, origin: Vector, depth: float) -> Solid:
+        """Solid that cuts the opening through a wall of ``depth`` thickness."""
+        return Solid.extrude(self.face(plane, origin), plane.z_dir * -depth)
+
+
+def circle(port: str, wall: str, position: Vector, diameter: float) -> Cutout:
+    return Cutout(port, wall, (position.X, position.Y), "circle", diameter, diameter)
+
+
+def rectangle(port: str, wall: str, position: Vector, width: float, height: float) -> Cutout:
+    return Cutout(port, wall, (position.X, position.Y), "rectangle", width, height)
+
+
+def case_cutouts(params: Parameters) -> List[Cutout]:
+    """All the openings of the case."""
+    pcb = params.pcb
+    cutouts: List[Cutout] = []
+
+    # RCA connector holes
+    rca_port_diameter = 8.3
+    rca_port_hole_diameter = rca_port_diameter + 1
+    rca_port_distance = 22.1 - rca_port_diameter  # From centers of the ports
+    rca_right_from_pcb = Vector(
+        pcb.width / 2 - (39.6 - rca_port_diameter / 2),
+        -(12.2 - rca_port_diameter / 2 - pcb.thickness / 2),
+    )
+    rca_right_location = -rca_right_from_pcb
+    rca_video_locations = [
+        rca_right_location,
+        rca_right_location + Vector(rca_port_distance, 0),
+        rca_right_location + Vector(rca_port_distance, 0) * 2,
+    ]
+    rca_audio_locations = [
+        rca_right_location - Vector(rca_port_distance, 0),
+        rca_right_location - Vector(rca_port_distance, 0) * 2,
+    ]
+    rca_audio_screw_hole_location = ShapeList(rca_audio_locations).center().add((0, 7, 0))
+    rca_audio_screw_hole_radius = 2.5/2 # M3 size
+    cutouts += [circle("RCA video", "front", l, rca_port_hole_diameter) for l in rca_video_locations]
+    cutouts += [circle("RCA audio", "front", l, rca_port_hole_diameter) for l in rca_audio_locations]
+    cutouts.append(circle("RCA audio screw", "front", rca_audio_screw_hole_location, rca_audio_screw_hole_radius * 2))
+
+    # VGA input connector hole
+    vga_width = 31
+    vga_height = 14.2 - pcb.thickness
+    vga_from_pcb_front = Vector(
+        -(vga_width / 2 - 44.5),
+        vga_height / 2 + pcb.thickness / 2
+    )
+    cutouts.append(rectangle("VGA", "front", vga_from_pcb_front, vga_width, vga_height))
+
+    # Scart connector hole
+    scart_width = 47.2
+    scart_height = 16.4
+    scart_ideal_distance_from_pcb_z = 20
+    scart_from_pcb_left = Vector(
+        0,
+        scart_ideal_distance_from_pcb_z
+    )
+    scart_screw_hole_locations = [
+        scart_from_pcb_left + Vector(6.0 +  scart_width / 2, 0, 0),
+        scart_from_pcb_left - Vector(5.7 +  scart_width / 2, 0, 0),
+    ]
+    scart_screw_hole_radius=1.1
+    cutouts.append(rectangle("SCART", "left", scart_from_pcb_left, scart_width, scart_height))
+    cutouts += [circle("SCART screw", "left", l, scart_screw_hole_radius * 2) for l in scart_screw_hole_locations]
+
+    # HDMI connector hole and screw holes
+    @dataclass(frozen=True)
+    class HdmiFemaleConnector:
+        width = 14.0
+        height = 4.55
+        hole_width = width + 1
+        hole_height = height + 1
+        hole_distance_from_top = 4
+        screw_hole_radius = params.hdmi_holder_screw_hole_radius
+        screw_hole_distance = params.audiojack_hdmi_distance_x
+        offset_y_from_pcb = 20#8.1
+
+    hdmi_connector_hole_from_pcb_back = Vector(
+        0,
+        HdmiFemaleConnector.offset_y_from_pcb
+    )
+    hole_0_location = hdmi_connector_hole_from_pcb_back + Vector(-HdmiFemaleConnector.screw_hole_distance, 0)
+    hole_1_location = hdmi_connector_hole_from_pcb_back + Vector(HdmiFemaleConnector.screw_hole_distance, 0)
+    cutouts.append(rectangle("HDMI", "back", hdmi_connector_hole_from_pcb_back, HdmiFemaleConnector.hole_width, HdmiFemaleConnector.hole_height))
+    cutouts += [circle("HDMI screw", "back", l, HdmiFemaleConnector.screw_hole_radius * 2) for l in [hole_0_location, hole_1_location]]
+
+    @dataclass(frozen=True)
+    class PowerHole:
+        width = 10.0
+        height = 10.0
+        distance_from_pcb_side_x = 20.65 - width/2
+        distance_from_pcb_side_y = 7.0
+
+    power_hole_from_pcb_back = Vector(pcb.width / 2 - PowerHole.distance_from_pcb_side_x,
+                                      PowerHole.distance_from_pcb_side_y)
+    cutouts.append(rectangle("power", "back", power_hole_from_pcb_back, PowerHole.width, PowerHole.height))
+
+    return cutouts
+
+
+def cutout_tools(
+    cutouts: List[Cutout],
+    planes: Dict[str, Plane],
+    origin: Vector,
+    depth: float,
+) -> List[Solid]:
+    """Tool solids of the cutouts, to be cut from the case all at once.
+
+    ``planes`` are the inner planes of the walls by name and ``origin`` is
+    the center of the PCB's edge in their local coordinates.
+    """
+    return [cutout.tool(planes[cutout.wall], origin, depth) for cutout in cutouts]
@@ -0,0 +1,192 @@
+"""Writing parts to files.
+
+Only OCP is imported here, so cached BREP files can be exported without
+paying for the build123d import.
+
+The meshes are made with one of the :data:`~gbs_case.parameters.MESH_PRESETS`,
+whose deflections are absolute, in millimeters and radians. OCP meshes the
+faces of a shape in parallel threads. STL files are written face by face straight from the
+faces' triangulations, so the whole mesh is never copied into one buffer.
+"""
+
+import math
+import os
+import struct
+import zipfile
+from io import BytesIO
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from OCP.BRep import BRep_Builder, BRep_Tool
+from OCP.BRepMesh import BRepMesh_IncrementalMesh
+from OCP.BRepTools import BRepTools
+from OCP.TopAbs import TopAbs_FACE, TopAbs_REVERSED
+from OCP.TopExp import TopExp_Explorer
+from OCP.TopLoc import TopLoc_Location
+from OCP.TopoDS import TopoDS, TopoDS_Shape
+
+from .parameters import MESH_PRESETS
+
+Point = Tuple[float, float, float]
+
+
+def read_brep(source: Union[str, os.PathLike, bytes]) -> TopoDS_Shape:
+    """Read a shape from a BREP file, or from BREP data in memory."""
+    shape = TopoDS_Shape()
+    if isinstance(source, bytes):
+        BRepTools.Read_s(shape, BytesIO(source), BRep_Builder())
+    else:
+        BRepTools.Read_s(shape, os.fspath(source), BRep_Builder())
+    if shape.IsNull():
+        raise ValueError("Could not read BREP data" if isinstance(source, bytes) else f"Could not read {source}")
+    return shape
+
+
+def mesh(shape: TopoDS_Shape, preset: str = "print"):
+    """Mesh the faces of ``shape`` in place, replacing any mesh they had."""
+    settings = MESH_PRESETS[preset]
+    # An existing mesh finer than the preset would otherwise be kept.
+    BRepTools.Clean_s(shape)
+    BRepMesh_IncrementalMesh(shape, settings.linear_deflection, False, settings.angular_deflection, True).Perform()
+
+
+def _faces(shape: TopoDS_Shape) -> Iterator:
+    explorer = TopExp_Explorer(shape, TopAbs_FACE)
+    while explorer.More():
+        yield TopoDS.Face(explorer.Current())
+        explorer.Next()
+
+
+def face_triangles(shape: TopoDS_Shape) -> Iterator[List[Tuple[Point, Point, Point]]]:
+    """The triangles of the meshed ``shape``, one list per face, counterclockwise seen from outside."""
+    for face in _faces(shape):
+        location = TopLoc_Location()
+        triangulation = BRep_Tool.Triangulation_s(face, location)
+        if triangulation is None:
+            continue
+        transform = location.Transformation()
+        nodes = [
+            triangulation.Node(i).Transformed(transform).Coord()
+            for i in range(1, triangulation.NbNodes() + 1)
+        ]
+        reversed_face = face.Orientation() == TopAbs_REVERSED
+        triangles = []
+        for i in range(1, triangulation.NbTriangles() + 1):
+            first, second, third = triangulation.Triangle(i).Get()
+            if reversed_face:
+                second, third = third, second
+            triangles.append((nodes[first - 1], nodes[second - 1], nodes[third - 1]))
+        yield triangles
+
+
+def triangle_count(shape: TopoDS_Shape) -> int:
+    count = 0
+    for face in _faces(shape):
+        triangulation = BRep_Tool.Triangulation_s(face, TopLoc_Location())
+        if triangulation is not None:
+            count += triangulation.NbTriangles()
+    return count
+
+
+def _normal(a: Point, b: Point, c: Point) -> Point:
+    u = (b[0] - a[0], b[1] - a[1], b[2] - a[2])
+    v = (c[0] - a[0], c[1] - a[1], c[2] - a[2])
+    n = (u[1] * v[2] - u[2] * v[1], u[2] * v[0] - u[0] * v[2], u[0] * v[1] - u[1] * v[0])
+    length = math.sqrt(n[0] ** 2 + n[1] ** 2 + n[2] ** 2) or 1.0
+    return n[0] / length, n[1] / length, n[2] / length
+
+
+_STL_TRIANGLE = struct.Struct("<12fH")
+
+
+def write_stl(shape: TopoDS_Shape, path: Union[str, os.PathLike], preset: str = "print") -> int:
+    """Mesh ``shape`` and write it as a binary STL, one face at a time. Returns the triangle count."""
+    mesh(shape, preset)
+    count = triangle_count(shape)
+    with open(path, "wb") as stl:
+        stl.write(b"gbs_case".ljust(80, b" "))
+        stl.write(struct.pack("<I", count))
+        for triangles in face_triangles(shape):
+            chunk = bytearray()
+            for a, b, c in triangles:
+                chunk += _STL_TRIANGLE.pack(*_normal(a, b, c), *a, *b, *c, 0)
+            stl.write(chunk)
+    return count
+
+
+_3MF_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>
+</Types>
+"""
+
+_3MF_RELATIONSHIPS = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Target="/3D/3dmodel.model" Id="rel0" Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>
+</Relationships>
+"""
+
+
+def _3mf_transform(transform: Tuple[Tuple[Point, Point, Point], Point]) -> str:
+    # 3MF transforms row vectors, so the rotation goes in transposed.
+    rotation, offset = transform
+    values = [rotation[row][column] for column in range(3) for row in range(3)] + list(offset)
+    return " ".join(f"{value:.6g}" for value in values)
+
+
+def write_3mf(
+    shapes: Dict[str, TopoDS_Shape],
+    path: Union[str, os.PathLike],
+    preset: str = "print",
+    items: Optional[List[Tuple[str, Tuple[Tuple[Point, Point, Point], Point]]]] = None,
+) -> int:
+    """Write the shapes as the objects of one 3MF file. Returns the total triangle count.
+
+    3MF meshes share their vertices between triangles, so the nodes that the
+    faces' triangulations have in common along their edges are merged.
+
+    ``items`` places the objects on the plate, as (name, (rotation, offset)),
+    where the rotation is a 3x3 matrix, rows first; an object may be placed
+    any number of times. By default every object is placed once, as it is.
+    """
+    total = 0
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr("[Content_Types].xml", _3MF_CONTENT_TYPES)
+        package.writestr("_rels/.rels", _3MF_RELATIONSHIPS)
+        with package.open("3D/3dmodel.model", "w") as model:
+            model.write(
+                b'<?xml version="1.0" encoding="UTF-8"?>\n'
+                b'<model unit="millimeter" xml:lang="en-US" '
+                b'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">\n<resources>\n'
+            )
+            for object_id, (name, shape) in enumerate(shapes.items(), start=1):
+                mesh(shape, preset)
+                vertices: Dict[Point, int] = {}
+                indices = []
+                for triangles in face_triangles(shape):
+                    for triangle in triangles:
+                        corners = tuple(
+                            vertices.setdefault(tuple(round(value, 6) for value in point), len(vertices))
+                            for point in triangle
+                        )
+                        # Slivers whose corners were merged into fewer than three vertices.
+                        if len(set(corners)) == 3:
+                            indices.append(corners)
+                total += len(indices)
+                model.write(f'<object id="{object_id}" name="{name}" type="model">\n<mesh>\n<vertices>\n'.encode())
+                model.write("".join(f'<vertex x="{x}" y="{y}" z="{z}"/>\n' for x, y, z in vertices).encode())
+                model.write(b"</vertices>\n<triangles>\n")
+                model.write("".join(f'<triangle v1="{a}" v2="{b}" v3="{c}"/>\n' for a, b, c in indices).encode())
+                model.write(b"</triangles>\n</mesh>\n</object>\n")
+            model.write(b"</resources>\n<build>\n")
+            if items is None:
+                for object_id in range(1, len(shapes) + 1):
+                    model.write(f'<item objectid="{object_id}"/>\n'.encode())
+            else:
+                object_ids = {name: object_id for object_id, name in enumerate(shapes, start=1)}
+                for name, transform in items:
+                    model.write(
+                        f'<item objectid="{object_ids[name]}" transform="{_3mf_transform(transform)}"/>\n'.encode()
+                    )
+            model.write(b"</build>\n</model>\n")
+    return total
@@ -0,0 +1,78 @@
+"""The parts as functions, for scripts that use the case as a library.
+
+    from gbs_case import Parameters, build_pcb
+
+    pcb = build_pcb(Parameters())
+
+Importing this module doesn't import build123d, the first build does. Each
+part is built once per set of the parameters it is built from (see
+:meth:`~gbs_case.parameters.Parameters.inputs_of`), and only the part that
+is asked for is built. Every call returns a copy of the memoized part, so
+moving or connecting it doesn't change what the next call returns.
+
+With a :class:`~gbs_case.cache.PartCache`, a part that isn't memoized yet is
+loaded from, or stored to, that cache too.
+"""
+
+import copy
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from .parameters import Parameters
+
+if TYPE_CHECKING:
+    from build123d import Compound, Part
+
+    from .cache import PartCache
+
+_memo: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], "Part"] = {}
+
+
+def build_part(name: str, params: Optional[Parameters] = None, cache: Optional["PartCache"] = None) -> "Part":
+    """A copy of the part ``name``, one of :data:`~gbs_case.parts.PART_BUILDERS`."""
+    params = Parameters() if params is None else params
+    key = (name, tuple(params.inputs_of(name).items()))
+    if key not in _memo:
+        if cache is None:
+            from .parts import PART_BUILDERS
+
+            _memo[key] = PART_BUILDERS[name](params)
+        else:
+            _memo[key] = cache.build(name, params)
+    return copy.deepcopy(_memo[key])
+
+
+def build_pcb(params: Optional[Parameters] = None, cache: Optional["PartCache"] = None) -> "Part":
+    return build_part("pcb", params, cache)
+
+
+def build_hdmi_holder(params: Optional[Parameters] = None, cache: Optional["PartCache"] = None) -> "Part":
+    return build_part("hdmi_holder", params, cache)
+
+
+def build_case(params: Optional[Parameters] = None, cache: Optional["PartCache"] = None) -> "Part":
+    return build_part("case", params, cache)
+
+
+def build_top_cover(params: Optional[Parameters] = None, cache: Optional["PartCache"] = None) -> "Part":
+    return build_part("top_cover", params, cache)
+
+
+def build_assembly(params: Optional[Parameters] = None, cache: Optional["PartCache"] = None) -> "Compound":
+    """All the parts, connected by their joints, in one labeled assembly."""
+    from build123d import Compound
+
+    from .parts import connect_parts
+
+    parts = {
+        "case": build_case(params, cache),
+        "top_cover": build_top_cover(params, cache),
+        "hdmi_holder": build_hdmi_holder(params, cache),
+        "pcb": build_pcb(params, cache),
+    }
+    connect_parts(parts)
+    return Compound(label="assembly", children=list(parts.values()))
+
+
+def clear():
+    """Forget the memoized parts."""
+    _memo.clear()
@@ -0,0 +1,159 @@
+"""Feature graphs: parts built from named, memoized steps.
+
+A part is described as a graph of features such as "shell", "pillars" or
+"fillet". Each feature is a function of the parameters and of the results
+of the features it depends on, which are named by its arguments::
+
+    case_graph = FeatureGraph("case")
+
+    @case_graph.feature(inputs=lambda params: params.case_outer_height)
+    def shell(params):
+        ...
+
+    @case_graph.feature()
+    def pillars(params, shell):
+        ...
+
+A feature's result is memoized on what ``inputs`` returns for the parameters
+and on the hashes of its dependencies' results. After a parameter change only
+the features whose inputs changed are computed again, and those downstream
+of them only if the result they depend on actually changed.
+:meth:`FeatureGraph.report` counts how often each feature was reused and
+computed, ``export --timings`` and the watch command print it.
+"""
+
+import dataclasses
+import hashlib
+import inspect
+from collections import Counter, OrderedDict
+from io import BytesIO
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from build123d import Location, Plane, Shape, Vector
+from OCP.BRepTools import BRepTools
+from OCP.TopTools import TopTools_FormatVersion_VERSION_1
+
+from .parameters import Parameters
+from .profiling import span
+
+
+def fingerprint(value: Any) -> str:
+    """Hash of a feature result: shapes, planes, vectors, plain data or containers of them."""
+    digest = hashlib.sha256()
+
+    def feed(value: Any):
+        if isinstance(value, Shape):
+            buffer = BytesIO()
+            # Without the meshes, which are added to the shape when it's shown or exported.
+            BRepTools.Write_s(value.wrapped, buffer, False, False, TopTools_FormatVersion_VERSION_1)
+            digest.update(buffer.getvalue())
+        elif isinstance(value, Plane):
+            feed((value.origin, value.x_dir, value.z_dir))
+        elif isinstance(value, Vector):
+            digest.update(repr((value.X, value.Y, value.Z)).encode())
+        elif isinstance(value, Location):
+            feed((value.position, value.orientation))
+        elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+            feed(dataclasses.astuple(value))
+        elif isinstance(value, dict):
+            for key in sorted(value):
+                feed((key, value[key]))
+        elif isinstance(value, (list, tuple)):
+            digest.update(b"(")
+            for item in value:
+                feed(item)
+            digest.update(b")")
+        else:
+            digest.update(repr(value).encode())
+
+    feed(value)
+    return digest.hexdigest()
+
+
+@dataclasses.dataclass
+class Feature:
+    name: str
+    function: Callable[..., Any]
+    inputs: Callable[[Parameters], Any]
+    dependencies: Tuple[str, ...]
+
+
+class FeatureGraph:
+    def __init__(self, name: str, max_entries: int = 256):
+        self.name = name
+        self.features: Dict[str, Feature] = {}
+        self.max_entries = max_entries
+        # key -> (result, fingerprint of the result)
+        self._memo: "OrderedDict[str, Tuple[Any, str]]" = OrderedDict()
+        # Feature name -> True when the last evaluation reused the memoized result.
+        self.hits: Dict[str, bool] = {}
+        # How often each feature was reused and computed, since reset_counts().
+        self.reused: Counter = Counter()
+        self.computed: Counter = Counter()
+
+    def feature(self, inputs: Callable[[Parameters], Any] = lambda params: None):
+        """Decorator adding a feature, named after the function.
+
+        The function's arguments after ``params`` name the features it
+        depends on, which have to be added first.
+        """
+
+        def add(function: Callable[..., Any]) -> Callable[..., Any]:
+            dependencies = tuple(inspect.signature(function).parameters)[1:]
+            for dependency in dependencies:
+                if dependency not in self.features:
+                    raise ValueError(f"{function.__name__} depends on unknown feature {dependency}")
+            self.features[function.__name__] = Feature(function.__name__, function, inputs, dependencies)
+            return function
+
+        return add
+
+    def evaluate(self, params: Parameters, target: Optional[str] = None) -> Any:
+        """Result of the ``target`` feature (by default the last one added)."""
+        target = list(self.features)[-1] if target is None else target
+        self.hits = {}
+        results: Dict[str, Tuple[Any, str]] = {}
+        self._evaluate(params, target, results)
+        return results[target][0]
+
+    def _evaluate(self, params: Parameters, name: str, results: Dict[str, Tuple[Any, str]]):
+        if name in results:
+            return
+        feature = self.features[name]
+        for dependency in feature.dependencies:
+            self._evaluate(params, dependency, results)
+
+        key = fingerprint((
+            self.name,
+            name,
+            feature.inputs(params),
+            [results[dependency][1] for dependency in feature.dependencies],
+        ))
+        if key in self._memo:
+            self._memo.move_to_end(key)
+            self.hits[name] = True
+            self.reused[name] += 1
+        else:
+            with span(f"{self.name}.{name}"):
+                result = feature.function(params, *(results[dependency][0] for dependency in feature.dependencies))
+            self._memo[key] = (result, fingerprint(result))
+            if len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+            self.hits[name] = False
+            self.computed[name] += 1
+        results[name] = self._memo[key]
+
+    def report(self) -> List[str]:
+        """One line per feature evaluated since :meth:`reset_counts`: how often it was reused and computed."""
+        return [
+            f"{self.name}.{name}: {self.reused[name]} reused, {self.computed[name]} computed"
+            for name in self.features
+            if self.reused[name] or self.computed[name]
+        ]
+
+    def reset_counts(self):
+        self.reused.clear()
+        self.computed.clear()
+
+    def clear(self):
+        self._memo.clear()
@@ -0,0 +1,61 @@
+"""Writing files atomically, and keeping cache directories within a size.
+
+Several processes may share the part, mesh and properties caches and write
+the same entries at once, so every file is written to a temporary file with
+a unique name in the same directory and then renamed over the target.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence, Union
+
+
+def temporary_path(path: Union[str, os.PathLike]) -> Path:
+    """A new, empty file next to ``path`` to write it to before renaming it."""
+    path = Path(path)
+    fd, temporary = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    return Path(temporary)
+
+
+@contextmanager
+def atomic_path(path: Union[str, os.PathLike]) -> Iterator[Path]:
+    """Path to write ``path`` to in the with block, which replaces ``path`` at its end."""
+    temporary = temporary_path(path)
+    try:
+        yield temporary
+        os.replace(temporary, path)
+    finally:
+        temporary.unlink(missing_ok=True)
+
+
+def atomic_write(path: Union[str, os.PathLike], data: Union[bytes, str]):
+    with atomic_path(path) as temporary:
+        if isinstance(data, str):
+            temporary.write_text(data)
+        else:
+            temporary.write_bytes(data)
+
+
+def evict(entries: Iterable[Sequence[Path]], max_size: int):
+    """Remove the least recently used entries until the rest fit in ``max_size`` bytes.
+
+    Each entry is a group of files that are removed together. Its use is
+    the modification time of its first file.
+    """
+    sized = []
+    for paths in entries:
+        try:
+            stats = [path.stat() for path in paths]
+        except OSError:
+            continue
+        sized.append((stats[0].st_mtime, sum(stat.st_size for stat in stats), paths))
+    total = sum(size for _, size, _ in sized)
+    for _, size, paths in sorted(sized, key=lambda entry: entry[0]):
+        if total <= max_size:
+            break
+        for path in paths:
+            path.unlink(missing_ok=True)
+        total -= size
@@ -0,0 +1,133 @@
+"""Golden fingerprints of the parts, for the geometric regression tests.
+
+A part is reduced to a fingerprint: volume, area, counts of faces, edges and
+vertices, bounding box, the joints' locations and, for the case, the centers
+of the port cutouts. The tests in ``tests/`` compare the fingerprints of a
+few parameter variants with the golden ones stored in the repository, within
+a tolerance, so that a change that moves a cutout or picks another face for
+a joint shows up even when the part still builds.
+
+The slower exact comparison uses golden BREP files and boolean differences.
+A BREP file is stored once per part and set of the inputs it is built from
+(see :meth:`~gbs_case.parameters.Parameters.inputs_of`), so the variants
+that share a part share its file.
+"""
+
+import hashlib
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from build123d import *
+
+from .brep import location_to_list, part_to_brep
+from .cache import canonical
+from .parameters import Parameters
+from .parts import CASE_PORTS, PART_BUILDERS, case_graph
+
+GOLDEN_DIRECTORY = Path(__file__).resolve().parent.parent / "golden"
+
+
+def fingerprint(name: str, part: Part, params: Parameters) -> Dict[str, Any]:
+    box = part.bounding_box()
+    result: Dict[str, Any] = {
+        "volume": part.volume,
+        "area": part.area,
+        "faces": len(part.faces()),
+        "edges": len(part.edges()),
+        "vertices": len(part.vertices()),
+        "bounding_box": [*box.min, *box.max],
+        "joints": {
+            label: location_to_list(joint.relative_location) for label, joint in sorted(part.joints.items())
+        },
+    }
+    if name == "case":
+        result["cutouts"] = {
+            port: [list(tool.center()) for tool in case_graph.evaluate(params, f"{port.lower()}_cut")]
+            for port in CASE_PORTS
+        }
+    return result
+
+
+def differences(golden: Any, current: Any, rel_tol: float, abs_tol: float, path: str = "") -> List[str]:
+    """Where ``current`` differs from ``golden``, numbers within the relative or absolute tolerance."""
+    if isinstance(golden, dict) and isinstance(current, dict):
+        found = []
+        for key in sorted(set(golden) | set(current)):
+            if key not in current:
+                found.append(f"{path}{key}: missing")
+            elif key not in golden:
+                found.append(f"{path}{key}: new")
+            else:
+                found += differences(golden[key], current[key], rel_tol, abs_tol, f"{path}{key}.")
+        return found
+    if isinstance(golden, list) and isinstance(current, list):
+        if len(golden) != len(current):
+            return [f"{path[:-1]}: {len(golden)} items, now {len(current)}"]
+        found = []
+        for index, (before, now) in enumerate(zip(golden, current)):
+            found += differences(before, now, rel_tol, abs_tol, f"{path}{index}.")
+        return found
+    if isinstance(golden, bool) or isinstance(current, bool) or isinstance(golden, int) and isinstance(current, int):
+        return [] if golden == current else [f"{path[:-1]}: {golden}, now {current}"]
+    if isinstance(golden, (int, float)) and isinstance(current, (int, float)):
+        if math.isclose(golden, current, rel_tol=rel_tol, abs_tol=abs_tol):
+            return []
+        return [f"{path[:-1]}: {golden:.6g}, now {current:.6g}"]
+    return [] if golden == current else [f"{path[:-1]}: {golden!r}, now {current!r}"]
+
+
+def exact_difference(part: Part, golden: Part) -> float:
+    """Volume of the symmetric difference of the part and its golden shape."""
+    volume = 0.0
+    for difference in (part - golden, golden - part):
+        volume += difference.volume if difference is not None else 0.0
+    return volume
+
+
+def brep_name(name: str, params: Parameters) -> str:
+    """File name of the golden BREP of the part, by the inputs it is built from."""
+    inputs = json.dumps(canonical(params.inputs_of(name)), sort_keys=True)
+    return f"{name}-{hashlib.sha256(inputs.encode()).hexdigest()[:12]}.brep"
+
+
+def exact_variants(variants: Dict[str, Parameters]) -> List[Tuple[str, str]]:
+    """(variant, part) for the first of ``variants`` of each distinct part and inputs."""
+    seen = set()
+    result = []
+    for variant, params in variants.items():
+        for name in PART_BUILDERS:
+            file_name = brep_name(name, params)
+            if file_name not in seen:
+                seen.add(file_name)
+                result.append((variant, name))
+    return result
+
+
+class GoldenStore:
+    """The golden fingerprints and BREP files in ``directory``."""
+
+    def __init__(self, directory: Union[str, Path] = GOLDEN_DIRECTORY):
+        self.directory = Path(directory)
+        self.fingerprints_path = self.directory / "fingerprints.json"
+        self.fingerprints: Dict[str, Dict[str, Any]] = (
+            json.loads(self.fingerprints_path.read_text()) if self.fingerprints_path.exists() else {}
+        )
+
+    def brep_path(self, name: str, params: Parameters) -> Path:
+        return self.directory / brep_name(name, params)
+
+    def read_brep(self, name: str, params: Parameters) -> Optional[Part]:
+        from .export import read_brep
+
+        path = self.brep_path(name, params)
+        return Part(read_brep(path)) if path.exists() else None
+
+    def write_brep(self, name: str, params: Parameters, part: Part):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.brep_path(name, params).write_bytes(part_to_brep(part)[0])
+
+    def save(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fingerprints_path.write_text(json.dumps(self.fingerprints, indent=1, sort_keys=True) + "\n")
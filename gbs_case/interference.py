@@ -0,0 +1,166 @@
+"""Interference and clearance checks of the assembled parts.
+
+The parts are only placed by their joints, so nothing keeps them from
+overlapping. The checks here run in two phases: a sweep over the bounding
+boxes of the parts finds the pairs that could come closer than a margin,
+and only those pairs get the exact, much slower, distance computation
+(BRepExtrema) and, when they touch, the boolean common that tells a contact
+from an overlap. Pairs that the broad phase rules out are reported with the
+distance of their bounding boxes as a lower bound.
+
+Besides the pairs of parts, there are two more kinds of results:
+
+* fits: the part of a child that goes into its parent past the joint plane,
+  like the top cover's insert, and its clearance to the parent;
+* ports: the clearance between each opening of the case and the other parts.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from build123d import *
+from build123d.topology import Shape
+from OCP.BRepExtrema import BRepExtrema_DistShapeShape
+
+from .cutouts import case_cutouts, cutout_tools
+from .parameters import Parameters
+from .parts import ASSEMBLY_JOINTS, case_graph, pcb_location_from_case_wall_inner_face
+
+# Distances and volumes below this count as zero.
+TOLERANCE = 1e-6
+
+# Joints whose child goes into the parent past the joint's plane, with a name
+# for that part of the child.
+FITS: Dict[Tuple[str, str], str] = {
+    ("case", "Lid"): "top cover insert",
+}
+
+
+@dataclass(frozen=True)
+class Clearance:
+    first: str
+    second: str
+    distance: float
+    overlap_volume: float = 0.0
+    # False when only the bounding boxes were compared, then ``distance`` is a lower bound.
+    exact: bool = True
+
+    @property
+    def status(self) -> str:
+        if self.overlap_volume > TOLERANCE:
+            return "interference"
+        if self.distance <= TOLERANCE:
+            return "contact"
+        return "clear"
+
+
+def box_distance(first: BoundBox, second: BoundBox) -> float:
+    gaps = [
+        max(second.min.X - first.max.X, first.min.X - second.max.X, 0),
+        max(second.min.Y - first.max.Y, first.min.Y - second.max.Y, 0),
+        max(second.min.Z - first.max.Z, first.min.Z - second.max.Z, 0),
+    ]
+    return sum(gap**2 for gap in gaps) ** 0.5
+
+
+def candidate_pairs(boxes: Dict[str, BoundBox], margin: float) -> List[Tuple[str, str]]:
+    """Pairs whose bounding boxes come closer than ``margin``.
+
+    Sweep and prune along X: the boxes are visited in order of their
+    minimum X, and each one is only compared with the boxes that are still
+    open at that X.
+    """
+    pairs = []
+    active: List[str] = []
+    for name in sorted(boxes, key=lambda name: boxes[name].min.X):
+        box = boxes[name]
+        active = [other for other in active if boxes[other].max.X + margin >= box.min.X]
+        for other in active:
+            if box_distance(boxes[other], box) <= margin:
+                pairs.append((other, name))
+        active.append(name)
+    return pairs
+
+
+def exact_clearance(first_name: str, first: Shape, second_name: str, second: Shape) -> Clearance:
+    calculation = BRepExtrema_DistShapeShape(first.wrapped, second.wrapped)
+    calculation.Perform()
+    if not calculation.IsDone():
+        raise RuntimeError(f"Could not compute the distance between {first_name} and {second_name}")
+    distance = calculation.Value()
+    # One shape inside the other also has a distance of zero.
+    overlap_volume = 0.0
+    if distance <= TOLERANCE or calculation.InnerSolution():
+        common = first.intersect(second)
+        overlap_volume = 0.0 if common is None else common.volume
+    return Clearance(first_name, second_name, distance, overlap_volume)
+
+
+def check_pairs(parts: Dict[str, Shape], margin: float = 5.0) -> List[Clearance]:
+    """Clearance of every pair of parts, exact for those closer than ``margin``."""
+    boxes = {name: part.bounding_box() for name, part in parts.items()}
+    candidates = set(candidate_pairs(boxes, margin))
+    names = list(parts)
+    results = []
+    for i, first in enumerate(names):
+        for second in names[i + 1:]:
+            if (first, second) in candidates or (second, first) in candidates:
+                results.append(exact_clearance(first, parts[first], second, parts[second]))
+            else:
+                results.append(Clearance(first, second, box_distance(boxes[first], boxes[second]), exact=False))
+    return results
+
+
+def check_fits(parts: Dict[str, Part]) -> List[Clearance]:
+    """Clearance between the parent and the part of the child past the joint plane."""
+    results = []
+    for parent, parent_joint, child, _ in ASSEMBLY_JOINTS:
+        name = FITS.get((parent, parent_joint))
+        if name is None or parent not in parts or child not in parts:
+            continue
+        joint_plane = Plane(parts[parent].joints[parent_joint].location)
+        inside = split(parts[child], bisect_by=joint_plane, keep=Keep.BOTTOM)
+        results.append(exact_clearance(name, inside, parent, parts[parent]))
+    return results
+
+
+def check_ports(params: Parameters, parts: Dict[str, Part]) -> List[Clearance]:
+    """Clearance between each opening of the case and the nearest other part.
+
+    A distance of zero means that the part reaches into the opening, like the
+    HDMI holder does.
+    """
+    case = parts["case"]
+    cutouts = case_cutouts(params)
+    tools = cutout_tools(
+        cutouts,
+        case_graph.evaluate(params, "wall_planes"),
+        pcb_location_from_case_wall_inner_face(params),
+        params.case_shell_thickness,
+    )
+    boxes = {name: part.bounding_box() for name, part in parts.items() if name != "case"}
+    results = []
+    for cutout, tool in zip(cutouts, tools):
+        tool = tool.moved(case.location)
+        tool_box = tool.bounding_box()
+        nearest: Optional[Clearance] = None
+        # Nearest bounding box first, so that the parts farther than the
+        # nearest one found so far can be skipped.
+        for name in sorted(boxes, key=lambda name: box_distance(tool_box, boxes[name])):
+            if nearest is not None and box_distance(tool_box, boxes[name]) >= nearest.distance:
+                break
+            clearance = exact_clearance(cutout.port, tool, name, parts[name])
+            if nearest is None or clearance.distance < nearest.distance:
+                nearest = clearance
+        if nearest is not None:
+            results.append(nearest)
+    return results
+
+
+def report(title: str, clearances: List[Clearance]) -> List[str]:
+    lines = [title]
+    for clearance in clearances:
+        distance = f"{clearance.distance:.3f}" if clearance.exact else f">{clearance.distance:.3f}"
+        overlap = f"  overlap {clearance.overlap_volume:.3f} mm³" if clearance.status == "interference" else ""
+        lines.append(f"  {clearance.first:<20} {clearance.second:<12} {distance:>10} mm  {clearance.status}{overlap}")
+    return lines
@@ -0,0 +1,276 @@
+"""Laying the printable parts out on build plates.
+
+Each part is first turned so that it lies flat: of the six axis aligned
+orientations, the one with the most planar face area on the plate wins,
+the lower one on a tie. The top cover, for example, goes upside down, on
+its plate rather than on the edge of its insert.
+
+The footprints, the bounding rectangles of the flat parts, are then packed
+with a skyline bottom-left packer, which may turn a footprint by 90°. When
+the copies don't fit on one plate, they go on more plates. A plate is
+written as one 3MF file in which every part is meshed once and placed as
+often as needed by the build items' transforms, see
+:func:`gbs_case.export.write_3mf`.
+
+Like :mod:`gbs_case.export`, this only needs OCP.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from OCP.Bnd import Bnd_Box
+from OCP.BRepAdaptor import BRepAdaptor_Surface
+from OCP.BRepBndLib import BRepBndLib
+from OCP.BRepGProp import BRepGProp
+from OCP.GeomAbs import GeomAbs_Plane
+from OCP.GProp import GProp_GProps
+from OCP.TopAbs import TopAbs_REVERSED
+from OCP.TopoDS import TopoDS_Shape
+
+from .export import _faces
+
+Vector3 = Tuple[float, float, float]
+Rotation = Tuple[Vector3, Vector3, Vector3]
+# 3x3 rotation, rows first, and the translation after it.
+Transform = Tuple[Rotation, Vector3]
+
+# Rotations that turn each direction to -Z, so that the faces pointing that
+# way lie on the plate.
+DOWN_ROTATIONS: Dict[str, Rotation] = {
+    "-Z": ((1, 0, 0), (0, 1, 0), (0, 0, 1)),
+    "+Z": ((1, 0, 0), (0, -1, 0), (0, 0, -1)),
+    "+X": ((0, 0, 1), (0, 1, 0), (-1, 0, 0)),
+    "-X": ((0, 0, -1), (0, 1, 0), (1, 0, 0)),
+    "+Y": ((1, 0, 0), (0, 0, 1), (0, -1, 0)),
+    "-Y": ((1, 0, 0), (0, 0, -1), (0, 1, 0)),
+}
+_DIRECTIONS: Dict[str, Vector3] = {
+    "-Z": (0, 0, -1), "+Z": (0, 0, 1), "+X": (1, 0, 0), "-X": (-1, 0, 0), "+Y": (0, 1, 0), "-Y": (0, -1, 0),
+}
+# Turns a part by 90° about Z on the plate.
+QUARTER_TURN: Rotation = ((0, -1, 0), (1, 0, 0), (0, 0, 1))
+
+TOLERANCE = 1e-6
+
+
+def _dot(a: Sequence[float], b: Sequence[float]) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+def rotate(rotation: Rotation, point: Sequence[float]) -> Vector3:
+    return tuple(_dot(row, point) for row in rotation)
+
+
+def compose(first: Rotation, second: Rotation) -> Rotation:
+    """The rotation ``first`` followed by ``second``."""
+    return tuple(tuple(_dot(second[row], [first[k][column] for k in range(3)]) for column in range(3)) for row in range(3))
+
+
+def _bounds(shape: TopoDS_Shape) -> Tuple[Vector3, Vector3]:
+    box = Bnd_Box()
+    BRepBndLib.AddOptimal_s(shape, box, False, False)
+    return box.CornerMin().Coord(), box.CornerMax().Coord()
+
+
+def rotated_bounds(bounds: Tuple[Vector3, Vector3], rotation: Rotation) -> Tuple[Vector3, Vector3]:
+    """Bounding box after an axis aligned rotation, from the one before it."""
+    low, high = bounds
+    corners = [rotate(rotation, (x, y, z)) for x in (low[0], high[0]) for y in (low[1], high[1]) for z in (low[2], high[2])]
+    return (
+        tuple(min(corner[i] for corner in corners) for i in range(3)),
+        tuple(max(corner[i] for corner in corners) for i in range(3)),
+    )
+
+
+@dataclass(frozen=True)
+class Orientation:
+    down: str
+    rotation: Rotation
+    # Area of the planar faces that lie on the plate, in mm².
+    contact_area: float
+    height: float
+
+
+def _planar_faces(shape: TopoDS_Shape) -> List[Tuple[Vector3, Vector3, float]]:
+    """Outward normal, center and area of each planar face."""
+    faces = []
+    for face in _faces(shape):
+        surface = BRepAdaptor_Surface(face)
+        if surface.GetType() != GeomAbs_Plane:
+            continue
+        normal = surface.Plane().Axis().Direction().Coord()
+        if face.Orientation() == TopAbs_REVERSED:
+            normal = tuple(-value for value in normal)
+        properties = GProp_GProps()
+        BRepGProp.SurfaceProperties_s(face, properties)
+        faces.append((normal, properties.CentreOfMass().Coord(), properties.Mass()))
+    return faces
+
+
+def flat_orientation(shape: TopoDS_Shape) -> Orientation:
+    """The orientation with the most planar face area on the plate."""
+    low, high = _bounds(shape)
+    faces = _planar_faces(shape)
+    orientations = []
+    for down, direction in _DIRECTIONS.items():
+        # How far the shape reaches in the direction that goes down.
+        extreme = max(_dot(direction, low), _dot(direction, high))
+        contact_area = sum(
+            area for normal, center, area in faces
+            if _dot(normal, direction) > 1 - TOLERANCE and abs(_dot(center, direction) - extreme) < 1e-3
+        )
+        height = abs(_dot(direction, high) - _dot(direction, low))
+        orientations.append(Orientation(down, DOWN_ROTATIONS[down], contact_area, height))
+    return max(orientations, key=lambda orientation: (round(orientation.contact_area, 3), -orientation.height))
+
+
+@dataclass(frozen=True)
+class Placement:
+    name: str
+    # Corner of the footprint with the lowest x and y, on the plate.
+    x: float
+    y: float
+    turned: bool
+
+
+class Skyline:
+    """Bottom-left rectangle packing along a skyline of (x, y, width) segments."""
+
+    def __init__(self, width: float, height: float):
+        self.width = width
+        self.height = height
+        self.segments: List[List[float]] = [[0.0, 0.0, width]]
+
+    def _fit(self, index: int, width: float, height: float) -> Optional[float]:
+        """Lowest y at which a rectangle starting at segment ``index`` fits."""
+        x = self.segments[index][0]
+        if x + width > self.width + TOLERANCE:
+            return None
+        y = 0.0
+        remaining = width
+        for segment_x, segment_y, segment_width in self.segments[index:]:
+            y = max(y, segment_y)
+            remaining -= segment_width
+            if remaining <= TOLERANCE:
+                break
+        if y + height > self.height + TOLERANCE:
+            return None
+        return y
+
+    def find(self, width: float, height: float) -> Optional[Tuple[float, float, int]]:
+        best = None
+        for index in range(len(self.segments)):
+            y = self._fit(index, width, height)
+            if y is not None and (best is None or (y, self.segments[index][0]) < (best[1], best[0])):
+                best = (self.segments[index][0], y, index)
+        return best
+
+    def place(self, x: float, y: float, width: float, height: float):
+        right = x + width
+        segments = []
+        for segment in self.segments:
+            segment_x, segment_y, segment_width = segment
+            segment_right = segment_x + segment_width
+            if segment_right <= x + TOLERANCE or segment_x >= right - TOLERANCE:
+                segments.append(segment)
+                continue
+            # Keep the parts of the segment left and right of the rectangle.
+            if segment_x < x:
+                segments.append([segment_x, segment_y, x - segment_x])
+            if segment_right > right:
+                segments.append([right, segment_y, segment_right - right])
+        segments.append([x, y + height, width])
+        segments.sort()
+        merged: List[List[float]] = []
+        for segment in segments:
+            if merged and abs(merged[-1][1] - segment[1]) < TOLERANCE:
+                merged[-1][2] += segment[2]
+            else:
+                merged.append(segment)
+        self.segments = merged
+
+
+def pack(
+    footprints: Sequence[Tuple[str, float, float]],
+    bed: Tuple[float, float],
+    spacing: float = 5.0,
+) -> List[List[Placement]]:
+    """Pack the footprints (name, width, depth) onto as many beds as needed.
+
+    Footprints are placed largest first, each turned by 90° when that lets it
+    sit lower. The parts keep ``spacing`` between each other.
+    """
+    bed_width, bed_depth = bed
+    for name, width, depth in footprints:
+        if not (width <= bed_width and depth <= bed_depth or depth <= bed_width and width <= bed_depth):
+            raise ValueError(f"{name} ({width:.1f} x {depth:.1f} mm) doesn't fit on a {bed_width:g} x {bed_depth:g} mm bed")
+
+    remaining = sorted(footprints, key=lambda footprint: (-footprint[1] * footprint[2], footprint[0]))
+    plates = []
+    while remaining:
+        skyline = Skyline(bed_width + spacing, bed_depth + spacing)
+        placements = []
+        left_over = []
+        for name, width, depth in remaining:
+            best = None
+            for turned, (w, d) in ((False, (width, depth)), (True, (depth, width))):
+                found = skyline.find(w + spacing, d + spacing)
+                if found is not None and (best is None or (found[1], found[0]) < (best[0][1], best[0][0])):
+                    best = (found, turned, w, d)
+            if best is None:
+                left_over.append((name, width, depth))
+                continue
+            (x, y, _), turned, w, d = best
+            skyline.place(x, y, w + spacing, d + spacing)
+            placements.append(Placement(name, x, y, turned))
+        plates.append(placements)
+        remaining = left_over
+    return plates
+
+
+def plate_transforms(
+    shapes: Dict[str, TopoDS_Shape],
+    copies: int,
+    bed: Tuple[float, float],
+    spacing: float = 5.0,
+) -> List[List[Tuple[str, Transform]]]:
+    """``copies`` of every shape laid flat and packed, as (name, transform) per plate.
+
+    Each plate's parts are centered on the bed, on its surface.
+    """
+    rotations = {name: flat_orientation(shape).rotation for name, shape in shapes.items()}
+    bounds = {name: rotated_bounds(_bounds(shape), rotations[name]) for name, shape in shapes.items()}
+    footprints = [
+        (name, high[0] - low[0], high[1] - low[1])
+        for _ in range(copies)
+        for name, (low, high) in bounds.items()
+    ]
+
+    plates = []
+    for placements in pack(footprints, bed, spacing):
+        items = []
+        for placement in placements:
+            rotation = rotations[placement.name]
+            if placement.turned:
+                rotation = compose(rotation, QUARTER_TURN)
+            low, _ = rotated_bounds(_bounds(shapes[placement.name]), rotation)
+            offset = (placement.x - low[0], placement.y - low[1], -low[2])
+            items.append((placement.name, (rotation, offset)))
+        plates.append(_centered(items, shapes, bed))
+    return plates
+
+
+def _centered(items: List[Tuple[str, Transform]], shapes: Dict[str, TopoDS_Shape], bed: Tuple[float, float]):
+    lows, highs = [], []
+    for name, (rotation, offset) in items:
+        low, high = rotated_bounds(_bounds(shapes[name]), rotation)
+        lows.append([low[i] + offset[i] for i in range(2)])
+        highs.append([high[i] + offset[i] for i in range(2)])
+    shift = [
+        (bed[i] - (max(high[i] for high in highs) - min(low[i] for low in lows))) / 2 - min(low[i] for low in lows)
+        for i in range(2)
+    ]
+    return [
+        (name, (rotation, (offset[0] + shift[0], offset[1] + shift[1], offset[2])))
+        for name, (rotation, offset) in items
+    ]
@@ -0,0 +1,184 @@
+"""Exports that only rewrite the files whose content changed.
+
+An :class:`ExportManifest` keeps ``manifest.json`` next to the exported
+files, with a fingerprint of the geometry and the export settings of each
+file. A file is only meshed and written again when either of them changed,
+or when the file is gone, so that whatever watches the output directory
+(a slicer, say) only sees the parts that actually changed. Files are written
+to a temporary name and then renamed, so nobody ever reads a half written
+file.
+
+The fingerprint is computed from the geometry rather than from the BREP
+data: meshing a shape, or reading it back from the part cache, changes its
+BREP data without changing the shape.
+
+Like :mod:`gbs_case.export`, this only needs OCP, except for STEP files.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Union
+
+from OCP.Bnd import Bnd_Box
+from OCP.BRep import BRep_Tool
+from OCP.BRepBndLib import BRepBndLib
+from OCP.BRepGProp import BRepGProp
+from OCP.GProp import GProp_GProps
+from OCP.TopAbs import TopAbs_EDGE, TopAbs_FACE, TopAbs_VERTEX
+from OCP.TopExp import TopExp_Explorer
+from OCP.TopoDS import TopoDS, TopoDS_Shape
+
+from .export import write_3mf, write_stl
+from .files import atomic_path, atomic_write
+from .parameters import MESH_PRESETS
+
+if TYPE_CHECKING:
+    from build123d import Shape
+
+MANIFEST_NAME = "manifest.json"
+
+
+def _count(shape: TopoDS_Shape, kind) -> int:
+    explorer = TopExp_Explorer(shape, kind)
+    count = 0
+    while explorer.More():
+        count += 1
+        explorer.Next()
+    return count
+
+
+def _vertices(shape: TopoDS_Shape) -> Iterator[tuple]:
+    explorer = TopExp_Explorer(shape, TopAbs_VERTEX)
+    while explorer.More():
+        point = BRep_Tool.Pnt_s(TopoDS.Vertex(explorer.Current()))
+        yield point.X(), point.Y(), point.Z()
+        explorer.Next()
+
+
+def shape_fingerprint(shape: TopoDS_Shape) -> str:
+    """Hash of the geometry of ``shape``, where it is placed included.
+
+    Made of the volume, area, center of mass and inertia, the bounding box,
+    the number of faces, edges and vertices, and the vertices' positions.
+    """
+    volume = GProp_GProps()
+    BRepGProp.VolumeProperties_s(shape, volume)
+    surface = GProp_GProps()
+    BRepGProp.SurfaceProperties_s(shape, surface)
+    box = Bnd_Box()
+    # Not from the mesh, which may or may not be there.
+    BRepBndLib.Add_s(shape, box, False)
+    center = volume.CentreOfMass()
+    matrix = volume.MatrixOfInertia()
+    inertia = [matrix.Value(row, column) for row in range(1, 4) for column in range(1, 4)]
+    scale = max(abs(value) for value in inertia) or 1.0
+    values = [
+        volume.Mass(),
+        surface.Mass(),
+        center.X(), center.Y(), center.Z(),
+        scale,
+        # Relative to the largest, as the products of inertia that should be
+        # zero are only zero up to the noise at the scale of the largest.
+        *(value / scale for value in inertia),
+        *box.CornerMin().Coord(),
+        *box.CornerMax().Coord(),
+        *sorted(_round(vertex) for vertex in _vertices(shape)),
+    ]
+    counts = [_count(shape, kind) for kind in (TopAbs_FACE, TopAbs_EDGE, TopAbs_VERTEX)]
+    # Rounded, as the last bits may differ between otherwise equal shapes.
+    data = repr((counts, [_round(value) for value in values]))
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def _round(value: Any) -> Any:
+    if isinstance(value, tuple):
+        return tuple(_round(item) for item in value)
+    # To micrometers first, so that values that should be zero, like the
+    # center of a symmetric part, are.
+    return float(f"{round(value, 6):.9g}") + 0.0
+
+
+def mesh_settings(file_format: str, preset: str) -> Dict[str, Any]:
+    settings = MESH_PRESETS[preset]
+    return {
+        "format": file_format,
+        "preset": preset,
+        "linear_deflection": settings.linear_deflection,
+        "angular_deflection": settings.angular_deflection,
+    }
+
+
+class ExportManifest:
+    def __init__(self, directory: Union[str, os.PathLike], force: bool = False):
+        self.directory = Path(directory)
+        self.path = self.directory / MANIFEST_NAME
+        self.force = force
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            self.entries = json.loads(self.path.read_text())
+        self.written: List[Path] = []
+        self.unchanged: List[Path] = []
+
+    def _key(self, path: Path) -> str:
+        return os.path.relpath(path, self.directory)
+
+    def is_current(self, path: Union[str, os.PathLike], fingerprint: str, settings: Dict[str, Any]) -> bool:
+        """Whether ``path`` exists and was written from the same geometry with the same settings."""
+        path = Path(path)
+        entry = {"fingerprint": fingerprint, "settings": settings}
+        return not self.force and path.exists() and self.entries.get(self._key(path)) == entry
+
+    def record(self, path: Union[str, os.PathLike], fingerprint: str, settings: Dict[str, Any]):
+        path = Path(path)
+        self.entries[self._key(path)] = {"fingerprint": fingerprint, "settings": settings}
+        self.written.append(path)
+
+    def _export(self, path: Union[str, os.PathLike], fingerprint: str, settings: Dict[str, Any], write) -> bool:
+        path = Path(path)
+        if self.is_current(path, fingerprint, settings):
+            self.unchanged.append(path)
+            return False
+        with atomic_path(path) as temporary:
+            write(temporary)
+        self.record(path, fingerprint, settings)
+        return True
+
+    def stl(self, path: Union[str, os.PathLike], shape: TopoDS_Shape, preset: str = "print") -> bool:
+        """Write an STL of ``shape`` unless it is current. Returns whether it was written."""
+        return self._export(
+            path, shape_fingerprint(shape), mesh_settings("stl", preset),
+            lambda temporary: write_stl(shape, temporary, preset),
+        )
+
+    def three_mf(self, path: Union[str, os.PathLike], shapes: Dict[str, TopoDS_Shape], preset: str = "print") -> bool:
+        """Write a 3MF file of ``shapes`` unless it is current. Returns whether it was written."""
+        fingerprint = hashlib.sha256(
+            repr([(name, shape_fingerprint(shape)) for name, shape in shapes.items()]).encode()
+        ).hexdigest()
+        return self._export(
+            path, fingerprint, mesh_settings("3mf", preset),
+            lambda temporary: write_3mf(shapes, temporary, preset),
+        )
+
+    def step(self, path: Union[str, os.PathLike], assembly: "Shape") -> bool:
+        """Write a STEP file of a build123d assembly, with the labels and colors of its parts,
+        unless it is current. Returns whether it was written."""
+        from build123d import export_step
+
+        parts = assembly.leaves if assembly.children else [assembly]
+        fingerprint = hashlib.sha256(repr([
+            (part.label, None if part.color is None else list(part.color), shape_fingerprint(part.wrapped))
+            for part in parts
+        ] + [assembly.label]).encode()).hexdigest()
+
+        def write(temporary: Path):
+            if not export_step(assembly, temporary):
+                raise OSError(f"Could not write {path}")
+
+        return self._export(path, fingerprint, {"format": "step"}, write)
+
+    def save(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.path, json.dumps(self.entries, indent=2, sort_keys=True) + "\n")
@@ -0,0 +1,93 @@
+"""Memory-bounded builds, for many variants in one process.
+
+A part holds on to more than its shape. build123d records on the part, and
+on every face picked off it, the operations that made it and the shapes
+that went into them. The feature graphs, the factories and the templates
+also memoize intermediate results, so that the next variant builds faster.
+That is what a single run or a watch session wants. Over hundreds of
+variants in one process, like a sweep, it makes the memory grow.
+
+:func:`lean_build` builds one part and keeps only its final shape and its
+joints. It drops the part's provenance, releases the memos and hands the
+freed memory back to the OS. Each build reports the peak resident set size
+it reached, so a part that needs more than the others shows up::
+
+    for label, values, params in variants(grid):
+        part, usage = lean_build("case", params, cache)
+        print(label, usage.peak_rss / 2**20)
+
+Without the memos, variants that share a part only share it through the
+part cache.
+"""
+
+import ctypes
+import ctypes.util
+import gc
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from .parameters import Parameters
+from .profiling import current_rss, peak_rss, reset_peak_rss
+
+if TYPE_CHECKING:
+    from build123d import Shape
+
+    from .cache import PartCache
+
+
+@dataclass(frozen=True)
+class BuildMemory:
+    name: str
+    seconds: float
+    # Peak resident set size while the part was built, in bytes. Where the
+    # peak can't be reset (outside Linux), the peak of the whole process.
+    peak_rss: int
+    # Resident set size once the intermediate results were released, in bytes.
+    rss: int
+
+
+def strip(shape: "Shape") -> "Shape":
+    """Drop the operation history of the shape and its children, in place.
+
+    What is left are the shapes, joints, labels and colors.
+    """
+    for node in (shape, *shape.descendants):
+        node._history = None
+        node.topo_path = ()
+    return shape
+
+
+def _trim():
+    # glibc keeps freed memory for later allocations, so the RSS wouldn't go down.
+    try:
+        ctypes.CDLL(ctypes.util.find_library("c")).malloc_trim(0)
+    except (OSError, AttributeError, TypeError):
+        pass
+
+
+def release():
+    """Forget the memoized features, parts and templates, and hand the freed memory back to the OS."""
+    from . import factory, templates
+    from .parts import FEATURE_GRAPHS
+
+    for graph in FEATURE_GRAPHS:
+        graph.clear()
+    factory.clear()
+    templates.clear()
+    gc.collect()
+    _trim()
+
+
+def lean_build(name: str, params: Parameters, cache: Optional["PartCache"] = None) -> Tuple["Shape", BuildMemory]:
+    """Build (or load) the part ``name``, then release everything but the part."""
+    from .factory import build_part
+
+    reset_peak_rss()
+    start = time.perf_counter()
+    part = build_part(name, params, cache)
+    seconds = time.perf_counter() - start
+    peak = peak_rss()
+    strip(part)
+    release()
+    return part, BuildMemory(name, seconds, peak, current_rss())
@@ -0,0 +1,102 @@
+"""Building and exporting parts in worker processes.
+
+The parts don't depend on each other geometrically, so each one can be built
+in its own process. Parts travel between processes as BREP data (see
+:mod:`gbs_case.brep`), and STL files are tessellated and written by the
+workers too.
+"""
+
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple, Union
+
+from .cache import PartCache
+from .parameters import Parameters
+
+if TYPE_CHECKING:
+    from build123d import Part
+
+
+def _context():
+    # Forked workers inherit the already imported build123d and OCP, spawned
+    # ones would have to import them again. Forking is only safe on Linux: on
+    # macOS the system libraries can crash a forked child, which is why spawn
+    # is the default there.
+    if sys.platform.startswith("linux"):
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def pool(jobs: Optional[int] = None) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=jobs, mp_context=_context())
+
+
+def _build(name: str, params: Parameters, cache: Optional[PartCache]) -> Tuple[bytes, dict]:
+    from .brep import part_to_brep
+    from .factory import build_part
+
+    part = build_part(name, params, cache)
+    return part_to_brep(part)
+
+
+def build_parts(
+    names: Iterable[str],
+    params: Parameters,
+    cache: Optional[PartCache] = None,
+    jobs: Optional[int] = None,
+) -> Dict[str, "Part"]:
+    """Build the parts in parallel, one worker process per part.
+
+    Parts that are already in the cache are loaded directly, without a
+    round trip through a worker.
+    """
+    from .brep import part_from_brep
+
+    parts: Dict[str, "Part"] = {}
+    missing = []
+    for name in names:
+        part = None if cache is None else cache.get(cache.key(name, params))
+        if part is None:
+            missing.append(name)
+        else:
+            parts[name] = part
+
+    if missing:
+        with pool(jobs or len(missing)) as executor:
+            futures = {name: executor.submit(_build, name, params, cache) for name in missing}
+            for name, future in futures.items():
+                parts[name] = part_from_brep(*future.result())
+
+    return {name: parts[name] for name in names}
+
+
+def _write_stl(brep: Union[bytes, str], path: str, preset: str) -> Tuple[int, float]:
+    from .export import read_brep, write_stl
+
+    start = time.perf_counter()
+    triangles = write_stl(read_brep(brep), path, preset)
+    return triangles, time.perf_counter() - start
+
+
+def export_stls(
+    files: Dict[Path, Union[bytes, Path]],
+    jobs: Optional[int] = None,
+    preset: str = "print",
+) -> Dict[Path, Tuple[int, float]]:
+    """Tessellate and write STL files in parallel.
+
+    ``files`` maps each STL path to the BREP data or BREP file of the shape.
+    Returns the triangle count and the seconds it took for each file.
+    """
+    with pool(jobs or len(files)) as executor:
+        futures = {
+            path: executor.submit(
+                _write_stl, brep if isinstance(brep, bytes) else os.fspath(brep), os.fspath(path), preset,
+            )
+            for path, brep in files.items()
+        }
+        return {path: future.result() for path, future in futures.items()}
@@ -0,0 +1,236 @@
+"""Dimensions of the case and of the hardware that goes inside it.
+
+All lengths are in millimeters.
+"""
+
+import math
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Optional, Tuple
+
+WALLS = ("front", "back", "left", "right")
+
+
+@dataclass(frozen=True)
+class M3:
+    major_diameter: float = 3.0
+    minor_diameter: float = 2.459
+
+
+@dataclass(frozen=True)
+class ClearanceGap:
+    tight: float = 0.127
+    standard: float = 0.254
+    loose: float = 0.508
+
+
+@dataclass(frozen=True)
+class Pcb:
+    width: float = 117
+    length: float = 101
+    thickness: float = 1.68
+
+
+# Audio jack screw place
+@dataclass(frozen=True)
+class AudioJack:
+    hole_width: float = 6.6
+    hole_height: float = 26
+    near_pcb_width: float = 2.76
+
+
+@dataclass(frozen=True)
+class Hdmi:
+    holder_thickness: float = 8
+    adapter_width: float = 31.56
+    narrow_width: float = 13.1
+    narrow_length: float = 9
+    holder_wall_thickness: float = 4
+    holder_width: float = adapter_width + holder_wall_thickness
+    holder_length: float = 52
+
+
+@dataclass(frozen=True)
+class VentPattern:
+    """Layout of the ventilation holes.
+
+    ``hole`` is "circle" (of diameter ``hole_width``) or "slot", a stadium of
+    ``hole_length`` by ``hole_width`` along the local X axis. ``pitch`` is the
+    distance between hole centers along a row. ``margin`` is the minimum
+    amount of material kept between a hole and an obstacle or the edge of
+    the area.
+    """
+
+    pattern: str = "hex"  # "hex" or "grid"
+    hole: str = "circle"  # "circle" or "slot"
+    hole_width: float = 3.0
+    hole_length: float = 8.0
+    pitch: float = 5.0
+    margin: float = 3.0
+    walls: Tuple[str, ...] = WALLS
+
+    def __post_init__(self):
+        assert self.pattern in ("hex", "grid"), self.pattern
+        assert self.hole in ("circle", "slot"), self.hole
+        assert self.hole != "slot" or self.hole_length > self.hole_width, "slots must be longer than wide"
+        assert set(self.walls) <= set(WALLS), self.walls
+        assert self.pitch > self.hole_extent[0], "holes would overlap"
+        assert self.row_pitch > self.hole_extent[1], "rows would overlap"
+
+    @property
+    def hole_extent(self) -> Tuple[float, float]:
+        """Size of one hole along local X and Y."""
+        if self.hole == "slot":
+            return self.hole_length, self.hole_width
+        return self.hole_width, self.hole_width
+
+    @property
+    def row_pitch(self) -> float:
+        if self.pattern == "hex":
+            return self.pitch * math.sqrt(3) / 2
+        return self.pitch
+
+
+@dataclass(frozen=True)
+class Parameters:
+    """Everything the parts are built from.
+
+    The defaults describe the case as it is printed. Derived dimensions are
+    properties so that changing one field keeps the rest consistent.
+    """
+
+    pcb: Pcb = field(default_factory=Pcb)
+    hdmi: Hdmi = field(default_factory=Hdmi)
+    m3: M3 = field(default_factory=M3)
+
+    use_nob: bool = False
+
+    hole_diameter: float = 3.50  # Good enough for M3
+    hole_distance: float = 3.75
+
+    case_inner_side_gap_to_pcb: float = 5
+    case_shell_thickness: float = 4
+    case_inner_bottom_gap_to_pcb: float = 5
+    case_inner_pcb_hole_pillar_radius: float = 3.50 / 2 + 2  # hole_radius + 2
+    case_fillet_radius: float = 5.0
+    case_outer_height: float = 50
+
+    top_cover_gap: float = ClearanceGap.tight
+
+    # Ventilation holes, none by default.
+    case_vents: Optional[VentPattern] = None
+    top_cover_vents: Optional[VentPattern] = None
+
+    def __post_init__(self):
+        assert self.case_inner_pcb_hole_pillar_radius > self.hole_radius
+        assert self.case_inner_pcb_hole_pillar_hole_radius < self.case_inner_pcb_hole_pillar_radius
+        assert self.case_inner_pcb_hole_pillar_hole_radius <= self.hole_radius
+
+    @property
+    def hole_radius(self) -> float:
+        return self.hole_diameter / 2
+
+    @property
+    def holes(self) -> Tuple[Tuple[float, float], ...]:
+        """PCB mounting hole centers: rear right, front right, rear left, front left."""
+        x = self.pcb.width / 2 - self.hole_distance
+        y = self.pcb.length / 2 - self.hole_distance
+        return ((x, y), (x, -y), (-x, y), (-x, -y))
+
+    @property
+    def case_inner_width(self) -> float:
+        return self.pcb.width + self.case_inner_side_gap_to_pcb
+
+    @property
+    def case_inner_length(self) -> float:
+        return self.pcb.length + self.case_inner_side_gap_to_pcb
+
+    @property
+    def case_outer_width(self) -> float:
+        return self.case_inner_width + 2 * self.case_shell_thickness
+
+    @property
+    def case_outer_length(self) -> float:
+        return self.case_inner_length + 2 * self.case_shell_thickness
+
+    @property
+    def case_inner_height(self) -> float:
+        """Height of the inner walls, from the bottom to the open top."""
+        return self.case_outer_height - self.case_shell_thickness
+
+    @property
+    def case_inner_pcb_hole_pillar_height(self) -> float:
+        return self.case_inner_bottom_gap_to_pcb
+
+    @property
+    def case_inner_pcb_hole_pillar_hole_radius(self) -> float:
+        return self.hole_radius
+
+    @property
+    def hdmi_holder_screw_hole_radius(self) -> float:
+        return self.m3.minor_diameter / 2
+
+    @property
+    def audiojack_hdmi_distance_x(self) -> float:
+        return (self.hdmi.adapter_width - AudioJack.near_pcb_width) / 2
+
+    def inputs_of(self, part: str) -> Dict[str, Any]:
+        """The fields that the given part is built from.
+
+        Parts are only rebuilt when one of these changes.
+        """
+        return {name: getattr(self, name) for name in PART_INPUTS[part]}
+
+
+PRINTABLE_PARTS = ("case", "hdmi_holder", "top_cover")
+
+
+@dataclass(frozen=True)
+class MeshPreset:
+    """How finely parts are meshed for export."""
+
+    # Maximum distance between the mesh and the surface.
+    linear_deflection: float
+    # Maximum angle between the normals of neighbouring triangles, in radians.
+    angular_deflection: float
+
+
+MESH_PRESETS: Dict[str, MeshPreset] = {
+    "draft": MeshPreset(linear_deflection=0.1, angular_deflection=0.5),
+    # Well below what an FDM printer resolves.
+    "print": MeshPreset(linear_deflection=0.02, angular_deflection=0.2),
+    "fine": MeshPreset(linear_deflection=0.005, angular_deflection=0.1),
+}
+
+@dataclass(frozen=True)
+class Filament:
+    """What the parts are printed with, to estimate how much of it they take."""
+
+    # g/cm³
+    density: float
+    diameter: float = 1.75
+
+
+FILAMENTS: Dict[str, Filament] = {
+    "PLA": Filament(density=1.24),
+    "PETG": Filament(density=1.27),
+    "ABS": Filament(density=1.04),
+    "ASA": Filament(density=1.07),
+}
+
+_ALL_FIELDS = tuple(f.name for f in fields(Parameters))
+
+PART_INPUTS: Dict[str, Tuple[str, ...]] = {
+    "pcb": ("pcb", "hole_diameter", "hole_distance"),
+    "hdmi_holder": ("hdmi", "m3"),
+    "case": tuple(name for name in _ALL_FIELDS if name not in ("top_cover_gap", "top_cover_vents")),
+    "top_cover": (
+        "pcb",
+        "use_nob",
+        "case_inner_side_gap_to_pcb",
+        "case_shell_thickness",
+        "case_fillet_radius",
+        "case_outer_height",
+        "top_cover_gap",
+        "top_cover_vents",
+    ),
+}
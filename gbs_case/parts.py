@@ -0,0 +1,580 @@
+"""Builders for the parts of the case.
+
+Each ``build_*`` function takes :class:`~gbs_case.parameters.Parameters` and
+returns the finished part, joints included.
+"""
+
+import copy
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+
+from build123d import *
+
+from . import templates
+from .cutouts import Cutout, case_cutouts, cutout_tools
+from .features import FeatureGraph
+from .parameters import AudioJack, Parameters
+from .selectors import FaceIndex, face_index
+from .vents import vent_positions, vent_tools
+
+
+@dataclass(frozen=True)
+class ScrewHolder:
+    width: float = AudioJack.hole_width
+    length: float = 20
+
+
+@dataclass(frozen=True)
+class Nob:
+    """Snap nob on the inner side walls that keeps the top cover in place."""
+
+    width: float
+    location: Location
+    height: float = 3.0
+
+    @property
+    def extrusion(self) -> float:
+        return self.height / 2
+
+    @property
+    def chamfer_length(self) -> float:
+        return self.height / 2 - 0.001
+
+    @classmethod
+    def for_case(cls, params: Parameters) -> "Nob":
+        height = 3.0
+        return cls(
+            width=params.case_inner_length / 2,
+            height=height,
+            location=Location((
+                0, # center
+                params.case_inner_height / 2 - height / 2 - 1,
+            )),
+        )
+
+
+def pcb_location_from_case_wall_inner_face(params: Parameters) -> Vector:
+    """Center of the PCB edge in the local coordinates of an inner wall plane."""
+    return Vector(
+        0,
+        -params.case_outer_height/2 + params.case_shell_thickness + params.case_inner_pcb_hole_pillar_height + params.pcb.thickness/2,
+    )
+
+
+def case_wall_planes(faces: FaceIndex) -> Dict[str, Plane]:
+    """Planes on the inner faces of the case walls, with local Y pointing up."""
+    case_front_wall_inner_face: Face = faces["front inner wall"]
+    case_back_wall_inner_face: Face = faces["back inner wall"]
+    case_left_wall_inner_face: Face = faces["left inner wall"]
+    case_right_wall_inner_face: Face = faces["right inner wall"]
+
+    return {
+        "front": Plane(case_front_wall_inner_face).rotated((0,-90,0)),
+        "back": Plane(case_back_wall_inner_face).rotated((0,90,0)),
+        "left": Plane(case_left_wall_inner_face).rotated((-90,0,0)),
+        "right": Plane(case_right_wall_inner_face).rotated((90,0,0)),
+    }
+
+
+def top_cover_insert_height(params: Parameters) -> float:
+    """How deep the top cover reaches into the case."""
+    return Nob.for_case(params).height + 2
+
+
+def case_vent_tools(
+    params: Parameters,
+    wall_planes: Dict[str, Plane],
+    cutouts: List[Cutout],
+    origin: Vector,
+    pillar_tops: List[Vector],
+) -> List[Solid]:
+    """Tools for the ventilation holes of the case walls.
+
+    Holes are kept away from the port cutouts (and so the HDMI joint), from
+    the pillars standing next to the wall and from the top of the wall,
+    which the top cover's insert and the lid joint cover.
+    """
+    pattern = params.case_vents
+    insert_height = top_cover_insert_height(params)
+    pillar_radius = params.case_inner_pcb_hole_pillar_radius
+    pillar_height = params.case_inner_pcb_hole_pillar_height
+
+    tools = []
+    for wall in pattern.walls:
+        plane = wall_planes[wall]
+        if wall in ("front", "back"):
+            span, depth = params.case_inner_width, params.case_inner_length
+        else:
+            span, depth = params.case_inner_length, params.case_inner_width
+        top = params.case_inner_height / 2
+        area = (-span / 2, -top, span / 2, top)
+
+        obstacles = [cutout.bounds(origin) for cutout in cutouts if cutout.wall == wall]
+        obstacles.append((-span / 2, top - insert_height, span / 2, top))
+        for pillar_top in pillar_tops:
+            local = plane.to_local_coords(pillar_top)
+            # Only the pillars on this wall's half of the case.
+            if 0 <= local.Z < depth / 2:
+                obstacles.append((local.X - pillar_radius, local.Y - pillar_height, local.X + pillar_radius, local.Y))
+
+        positions = vent_positions(pattern, area, obstacles)
+        tools += vent_tools(pattern, plane, positions, start=0.5, depth=-(params.case_shell_thickness + 1))
+    return tools
+
+
+def top_cover_vent_tools(params: Parameters, joints: List[Location]) -> List[Solid]:
+    """Tools for the ventilation holes of the top cover, through the cover and its insert."""
+    pattern = params.top_cover_vents
+    insert_height = top_cover_insert_height(params)
+    half_width = params.case_inner_width / 2 - params.top_cover_gap
+    half_length = params.case_inner_length / 2 - params.top_cover_gap
+    area = (-half_width, -half_length, half_width, half_length)
+    obstacles = [(joint.position.X, joint.position.Y, joint.position.X, joint.position.Y) for joint in joints]
+    positions = vent_positions(pattern, area, obstacles)
+    return vent_tools(
+        pattern, Plane.XY, positions,
+        start=-(insert_height + 0.5),
+        depth=insert_height + params.case_shell_thickness + 1,
+    )
+
+
+def build_pcb(params: Parameters) -> Part:
+    pcb = params.pcb
+    holes = params.holes
+    with BuildPart() as pcb_bp:
+        with BuildSketch():
+            Rectangle(pcb.width, pcb.length)
+        extrude(amount=pcb.thickness)
+
+        hole = templates.hole(params.hole_diameter / 2, pcb.thickness)
+        insert(templates.place(hole, [Pos(x, y, pcb.thickness) for x, y in holes]), mode=Mode.SUBTRACT)
+
+        joint_locations: List[Location] = [Location((hole[0], hole[1], 0) ) for hole in holes]
+
+        RigidJoint(label="PCB hole front left", joint_location=joint_locations[3])
+        RigidJoint(label="PCB hole front right", joint_location=joint_locations[1])
+        RigidJoint(label="PCB hole rear left", joint_location=joint_locations[2])
+        RigidJoint(label="PCB hole rear right", joint_location=joint_locations[0])
+
+    part = pcb_bp.part
+    part.label = "pcb"
+    part.color = Color(0x046307)
+    return part
+
+
+def build_hdmi_holder(params: Parameters) -> Part:
+    hdmi = params.hdmi
+    with BuildPart() as hdmi_holder_bp:
+        dir_down = Vector(0, 0, -1)
+
+        # Base block
+        with BuildSketch():
+            Rectangle(hdmi.holder_width, hdmi.holder_length)
+        extrude(amount=hdmi.holder_thickness)
+
+        faces = face_index(hdmi_holder_bp)
+        top = faces.outer("top")
+        bottom = faces.outer("bottom")
+        front = faces.outer("front")
+
+        # Hollow
+        hollow_extrude = 6
+        with BuildSketch(top):
+            Rectangle(hdmi.adapter_width, hdmi.holder_length)
+        extrude(amount=-hollow_extrude, mode=Mode.SUBTRACT)
+
+        # Narrowing the holder at the adapter's neck
+        neck_pos = (0, 36.9 - hdmi.holder_length / 2)
+        neck_extrude = 3.4 + 2
+        with BuildSketch(bottom.__neg__()):
+            with Locations([neck_pos]):
+                Rectangle(hdmi.holder_width, hdmi.narrow_length)
+                Rectangle(hdmi.narrow_width, hdmi.narrow_length, mode=Mode.SUBTRACT)
+        extrude(amount=neck_extrude)
+
+        # Audio jack screw place
+        audiojack_offset_x = hdmi.adapter_width / 2 - AudioJack.near_pcb_width - AudioJack.hole_width / 2
+        with BuildSketch(top):
+            with Locations(
+                [
+                    (
+                        audiojack_offset_x,
+                        - hdmi.holder_length / 2,
+                    )
+                ]
+            ):
+                Rectangle(AudioJack.hole_width, AudioJack.hole_height)
+        extrude(until=bottom, dir=dir_down)
+
+        with BuildSketch():
+            with Locations(
+                (
+                    -(hdmi.adapter_width + ScrewHolder.width)/2,
+                    -(hdmi.holder_length - ScrewHolder.length)/2
+                )):
+                Rectangle(ScrewHolder.width, ScrewHolder.length)
+        extrude(amount=hdmi.holder_thickness)
+
+        screw_hole_depth = 10
+        left_hole_location = Vector(-hdmi.adapter_width/2 - ScrewHolder.width/2, 0)
+        right_hole_location = Vector(hdmi.adapter_width/2 - AudioJack.hole_width/2 - AudioJack.near_pcb_width, 0)
+        screw_hole = templates.hole(params.hdmi_holder_screw_hole_radius, screw_hole_depth)
+        insert(templates.place(screw_hole, [
+            Plane(front).location * Pos(hole_location) for hole_location in (left_hole_location, right_hole_location)
+        ]), mode=Mode.SUBTRACT)
+
+        RigidJoint(label="HDMI left hole", joint_location=Location((
+            left_hole_location.X,
+            -hdmi.holder_length/2,
+            hdmi.holder_thickness/2
+        )))
+
+        RigidJoint(label="HDMI right hole", joint_location=Location((
+            right_hole_location.X,
+            -hdmi.holder_length/2,
+            hdmi.holder_thickness/2
+        )))
+
+        hdmi_connector_offset_x = -(AudioJack.hole_width + AudioJack.near_pcb_width)/2
+        RigidJoint(label="HDMI female connector", joint_location=Location((
+            hdmi_connector_offset_x,
+            -hdmi.holder_length/2,
+            hdmi.holder_thickness/2
+        )))
+
+    part = hdmi_holder_bp.part
+    part.label = "hdmi_holder"
+    part.color = Color("orange")
+    return part
+
+
+CASE_PORTS = ("RCA", "VGA", "SCART", "HDMI", "power")
+
+case_graph = FeatureGraph("case")
+
+
+@case_graph.feature(inputs=lambda params: (
+    params.case_outer_width, params.case_outer_length, params.case_outer_height, params.case_shell_thickness,
+))
+def shell(params: Parameters) -> Part:
+    with BuildPart() as case_bp:
+        Box(params.case_outer_width, params.case_outer_length, params.case_outer_height)
+        top_face = face_index(case_bp).outer("top")
+        offset(amount=-params.case_shell_thickness, openings=top_face)
+    return case_bp.part
+
+
+@case_graph.feature(inputs=lambda params: (
+    params.holes,
+    params.case_inner_pcb_hole_pillar_radius,
+    params.case_inner_pcb_hole_pillar_hole_radius,
+    params.case_inner_pcb_hole_pillar_height,
+))
+def pillars(params: Parameters, shell: Part) -> Part:
+    with BuildPart() as case_bp:
+        insert(shell)
+        # Bottom of the case.
+        case_bottom_top_face = face_index(case_bp).sorted(Axis.Z)[1]
+
+        # Pillars for PCB holes.
+        pillar = templates.pillar(
+            params.case_inner_pcb_hole_pillar_radius,
+            params.case_inner_pcb_hole_pillar_hole_radius,
+            params.case_inner_pcb_hole_pillar_height,
+        )
+        bottom = Plane(case_bottom_top_face).location
+        insert(templates.place(pillar, [bottom * Pos(x, y) for x, y in params.holes]))
+    return case_bp.part
+
+
+@case_graph.feature()
+def wall_planes(params: Parameters, shell: Part) -> Dict[str, Plane]:
+    return case_wall_planes(FaceIndex(shell.faces()))
+
+
+def _port_cutouts(params: Parameters, port: str) -> List[Cutout]:
+    return [cutout for cutout in case_cutouts(params) if cutout.port.split()[0] == port]
+
+
+def _add_port_feature(port: str):
+    """One feature per port, with the tool solids of its openings."""
+
+    def cut(params: Parameters, wall_planes: Dict[str, Plane]) -> List[Solid]:
+        return cutout_tools(
+            _port_cutouts(params, port), wall_planes,
+            pcb_location_from_case_wall_inner_face(params), params.case_shell_thickness,
+        )
+
+    cut.__name__ = f"{port.lower()}_cut"
+    case_graph.feature(inputs=lambda params: (
+        _port_cutouts(params, port),
+        pcb_location_from_case_wall_inner_face(params),
+        params.case_shell_thickness,
+    ))(cut)
+
+
+for port in CASE_PORTS:
+    _add_port_feature(port)
+
+
+@case_graph.feature(inputs=lambda params: None if params.case_vents is None else (
+    params.case_vents,
+    case_cutouts(params),
+    params.holes,
+    params.case_inner_pcb_hole_pillar_radius,
+    params.case_inner_pcb_hole_pillar_height,
+    params.case_inner_width,
+    params.case_inner_length,
+    params.case_inner_height,
+    top_cover_insert_height(params),
+    pcb_location_from_case_wall_inner_face(params),
+    params.case_shell_thickness,
+))
+def case_vents(params: Parameters, shell: Part, wall_planes: Dict[str, Plane]) -> List[Solid]:
+    if params.case_vents is None:
+        return []
+    return case_vent_tools(
+        params, wall_planes, case_cutouts(params),
+        pcb_location_from_case_wall_inner_face(params), case_pillar_tops(params, shell),
+    )
+
+
+@case_graph.feature()
+def cutouts(
+    params: Parameters,
+    pillars: Part,
+    rca_cut: List[Solid],
+    vga_cut: List[Solid],
+    scart_cut: List[Solid],
+    hdmi_cut: List[Solid],
+    power_cut: List[Solid],
+    case_vents: List[Solid],
+) -> Part:
+    """Connector and ventilation holes, all cut at once."""
+    with BuildPart() as case_bp:
+        insert(pillars)
+        insert(rca_cut + vga_cut + scart_cut + hdmi_cut + power_cut + case_vents, mode=Mode.SUBTRACT)
+    return case_bp.part
+
+
+@case_graph.feature(inputs=lambda params: params.use_nob and Nob.for_case(params))
+def nob(params: Parameters, cutouts: Part, wall_planes: Dict[str, Plane]) -> Part:
+    if not params.use_nob:
+        return cutouts
+
+    # Here we design the nob for an easy snapping case lid.
+    # Based on tutorial https://www.youtube.com/watch?v=VVmOtM60VWw
+    nob = Nob.for_case(params)
+    nob_solid = templates.nob(nob.width, nob.height, nob.extrusion, nob.chamfer_length)
+    with BuildPart() as case_bp:
+        insert(cutouts)
+        insert(templates.place(nob_solid, [wall_planes[wall].location * nob.location for wall in ("left", "right")]))
+    return case_bp.part
+
+
+@case_graph.feature(inputs=lambda params: params.case_fillet_radius)
+def case_fillet(params: Parameters, nob: Part, pillars: Part) -> Part:
+    # The edges are picked before the holes are cut, so that only the
+    # corners of the walls are selected.
+    faces = FaceIndex(pillars.faces())
+    case_front_wall_outer_face: Face = faces["front outer wall"]
+    case_back_wall_outer_face: Face = faces["back outer wall"]
+    corners = [
+        edge.center()
+        for edge in case_front_wall_outer_face.edges().filter_by(Axis.Z) + case_back_wall_outer_face.edges().filter_by(Axis.Z)
+    ]
+    with BuildPart() as case_bp:
+        insert(nob)
+        # The builder holds a copy of the part, so look the same edges up in it.
+        outer_vertical_edges = [
+            edge for edge in case_bp.edges().filter_by(Axis.Z)
+            if any((edge.center() - corner).length < 1e-6 for corner in corners)
+        ]
+        fillet(outer_vertical_edges, radius=params.case_fillet_radius)
+    return case_bp.part
+
+
+def case_pillar_tops(params: Parameters, shell: Part) -> List[Vector]:
+    """Centers of the pillars' top faces, rear right, front right, rear left, front left."""
+    case_bottom_top_face = FaceIndex(shell.faces()).sorted(Axis.Z)[1]
+    return [
+        Vector(hole[0], hole[1], params.case_inner_pcb_hole_pillar_height) + case_bottom_top_face.center_location.position
+        for hole in params.holes
+    ]
+
+
+def build_case(params: Parameters) -> Part:
+    shell = case_graph.evaluate(params, "shell")
+    wall_planes = case_graph.evaluate(params, "wall_planes")
+    # A deep copy, so that neither connecting the joints, which moves the
+    # part, nor meshing it for the viewer touches the memoized shape.
+    part = copy.deepcopy(case_graph.evaluate(params, "case_fillet"))
+
+    joint_locations: List[Location] = [Location(top) for top in case_pillar_tops(params, shell)]
+    RigidJoint(label="PCB pillar front left", to_part=part, joint_location=joint_locations[3])
+    RigidJoint(label="PCB pillar front right", to_part=part, joint_location=joint_locations[1])
+    RigidJoint(label="PCB pillar rear left", to_part=part, joint_location=joint_locations[2])
+    RigidJoint(label="PCB pillar rear right", to_part=part, joint_location=joint_locations[0])
+
+    hdmi_cutout = _port_cutouts(params, "HDMI")[0]
+    hdmi_connector_hole_location = Vector(*hdmi_cutout.position) + pcb_location_from_case_wall_inner_face(params)
+    hdmi_female_hole_location = Location(wall_planes["back"].from_local_coords(hdmi_connector_hole_location))
+    # Rotate hdmi hole by 180 degrees
+    hdmi_female_hole_location.orientation = (0, 0, 180)
+    RigidJoint(label="HDMI female hole", to_part=part, joint_location=hdmi_female_hole_location)
+
+    case_top_outer_face: Face = FaceIndex(shell.faces()).outer("top")
+    RigidJoint(label="Lid", to_part=part, joint_location=case_top_outer_face.center_location)
+
+    part.label = "case"
+    return part
+
+
+top_cover_graph = FeatureGraph("top_cover")
+
+
+@top_cover_graph.feature(inputs=lambda params: (
+    params.case_outer_width, params.case_outer_length, params.case_shell_thickness, params.case_fillet_radius,
+))
+def plate(params: Parameters) -> Tuple[Part, Face]:
+    """The filleted plate, and its bottom face from before the fillet."""
+    with BuildPart() as top_cover_bp:
+        with BuildSketch():
+            Rectangle(params.case_outer_width, params.case_outer_length)
+        extrude(amount=params.case_shell_thickness)
+
+        # Helper faces
+        faces = face_index(top_cover_bp)
+        top_cover_front_face: Face = faces.outer("front")
+        top_cover_back_face: Face = faces.outer("back")
+        top_cover_Bottom_face: Face = faces.outer("bottom")
+
+        outer_vertical_edges = top_cover_front_face.edges().filter_by(Axis.Z) + top_cover_back_face.edges().filter_by(Axis.Z)
+        fillet(outer_vertical_edges, radius=params.case_fillet_radius)
+    return top_cover_bp.part, top_cover_Bottom_face
+
+
+@top_cover_graph.feature(inputs=lambda params: (
+    params.case_shell_thickness, params.top_cover_gap, top_cover_insert_height(params),
+))
+def cover_insert(params: Parameters, plate: Tuple[Part, Face]) -> Tuple[Part, Face, Face]:
+    """The plate with the insert that goes into the case, and the insert's side faces."""
+    plate_part, top_cover_Bottom_face = plate
+    with BuildPart() as top_cover_bp:
+        insert(plate_part)
+        with BuildSketch(top_cover_Bottom_face):
+            offset(top_cover_Bottom_face, amount=-(params.case_shell_thickness + params.top_cover_gap))
+        extrude(amount=top_cover_insert_height(params))
+
+        extruded_faces = top_cover_bp.faces(Select.LAST)
+        extruded_shape_left_face: Face = extruded_faces.faces().sort_by(Axis.X)[0]
+        extruded_shape_right_face: Face = extruded_faces.faces().sort_by(-Axis.X)[0]
+    return top_cover_bp.part, extruded_shape_left_face, extruded_shape_right_face
+
+
+@top_cover_graph.feature(inputs=lambda params: params.use_nob and Nob.for_case(params))
+def inverse_nob(params: Parameters, cover_insert: Tuple[Part, Face, Face], plate: Tuple[Part, Face]) -> Part:
+    insert_part, extruded_shape_left_face, extruded_shape_right_face = cover_insert
+    if not params.use_nob:
+        return insert_part
+
+    nob = Nob.for_case(params)
+    filleted_top_cover_Bottom_face: Face = FaceIndex(plate[0].faces()).outer("bottom")
+
+    @dataclass(frozen=True)
+    class InverseNob:
+        width = nob.width
+        height = nob.height
+        extrusion = -nob.extrusion
+        taper_angle = 44.999
+
+    insert_faces = [extruded_shape_left_face, extruded_shape_right_face]
+    recess = templates.tapered_pad(InverseNob.width, InverseNob.height, -InverseNob.extrusion, InverseNob.taper_angle)
+    ease = templates.pad(InverseNob.width, InverseNob.height, 0.6)
+
+    with BuildPart() as top_cover_bp:
+        insert(insert_part)
+        insert(templates.place(recess, [Plane(face).location for face in insert_faces]), mode=Mode.SUBTRACT)
+
+        split(top_cover_bp.part, Plane(filleted_top_cover_Bottom_face), keep=Keep.BOTH)
+
+        bottom_solid = top_cover_bp.solids()[0]
+        top_solid = top_cover_bp.solids()[1]
+
+        bottom = bottom_solid.faces().sort_by(Axis.Z)[0]
+        offset(objects=bottom_solid, amount=-2, openings=bottom, kind=Kind.INTERSECTION)
+
+        # Ugly ease for the nob, but there is no better way that I know of
+        insert(templates.place(ease, [
+            Plane(face.moved(Location((0,0,-1)))).location for face in insert_faces
+        ]), mode=Mode.SUBTRACT)
+
+        insert(top_solid) # It disappears somehow from the part's shape list during the offset operation above
+    return top_cover_bp.part
+
+
+@top_cover_graph.feature(inputs=lambda params: None if params.top_cover_vents is None else (
+    params.top_cover_vents,
+    params.case_inner_width,
+    params.case_inner_length,
+    params.top_cover_gap,
+    params.case_shell_thickness,
+    top_cover_insert_height(params),
+))
+def top_cover_vents(params: Parameters, inverse_nob: Part, plate: Tuple[Part, Face]) -> Part:
+    if params.top_cover_vents is None:
+        return inverse_nob
+    with BuildPart() as top_cover_bp:
+        insert(inverse_nob)
+        insert(top_cover_vent_tools(params, [top_cover_lid_location(plate[1])]), mode=Mode.SUBTRACT)
+    return top_cover_bp.part
+
+
+def top_cover_lid_location(top_cover_Bottom_face: Face) -> Location:
+    lid_location = top_cover_Bottom_face.center_location
+    lid_location.orientation = (0, 0, 0)
+    return lid_location
+
+
+def build_top_cover(params: Parameters) -> Part:
+    _, top_cover_Bottom_face = top_cover_graph.evaluate(params, "plate")
+    part = copy.deepcopy(top_cover_graph.evaluate(params, "top_cover_vents"))
+
+    # Joint
+    RigidJoint(label="Lid", to_part=part, joint_location=top_cover_lid_location(top_cover_Bottom_face))
+
+    part.label = "top_cover"
+    return part
+
+
+PART_BUILDERS: Dict[str, Callable[[Parameters], Part]] = {
+    "pcb": build_pcb,
+    "hdmi_holder": build_hdmi_holder,
+    "case": build_case,
+    "top_cover": build_top_cover,
+}
+
+FEATURE_GRAPHS: Tuple[FeatureGraph, ...] = (case_graph, top_cover_graph)
+
+
+def feature_report() -> List[str]:
+    """Which features of the parts were reused and computed since the last report."""
+    lines = []
+    for graph in FEATURE_GRAPHS:
+        lines += graph.report()
+        graph.reset_counts()
+    return lines
+
+# How the parts are put together: parent part, parent joint, child part, child joint.
+ASSEMBLY_JOINTS: List[Tuple[str, str, str, str]] = [
+    ("case", "HDMI female hole", "hdmi_holder", "HDMI female connector"),
+    ("case", "PCB pillar front left", "pcb", "PCB hole front left"),
+    ("case", "Lid", "top_cover", "Lid"),
+]
+
+
+def connect_parts(parts: Dict[str, Part]):
+    """Move the child parts to their places, following ``ASSEMBLY_JOINTS``."""
+    for parent, parent_joint, child, child_joint in ASSEMBLY_JOINTS:
+        if parent in parts and child in parts:
+            parts[parent].joints[parent_joint].connect_to(parts[child].joints[child_joint])
@@ -0,0 +1,256 @@
+"""Opt-in profiling of builds.
+
+Inside ``with Profiler() as profiler:`` every ``BuildPart`` and
+``BuildSketch`` context and every call of the build123d operations in
+:data:`OPERATIONS` (and of ocp_vscode's ``show``, when it is imported) is
+recorded with its wall time, the growth of the peak resident set size and the
+number of faces and edges before and after::
+
+    with Profiler() as profiler:
+        part = build_case(params)
+    profiler.write_trace("trace.json")
+    print(profiler.summary())
+
+The trace opens in chrome://tracing or https://ui.perfetto.dev. Features of
+a :class:`~gbs_case.features.FeatureGraph` show up as spans of their own.
+Outside a profiler, nothing is patched and :func:`span` does nothing.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+OPERATIONS = ("add", "chamfer", "export_stl", "extrude", "fillet", "insert", "offset", "split")
+BUILDERS = ("BuildPart", "BuildSketch")
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process in bytes, 0 where unknown.
+
+    On Linux, this is the peak since the last :func:`reset_peak_rss`.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def reset_peak_rss() -> bool:
+    """Start over the peak of :func:`peak_rss` from the current size; False where that isn't possible."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes, the peak where unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return peak_rss()
+
+
+def _counts(shape: Any) -> Tuple[Optional[int], Optional[int]]:
+    from build123d import Shape
+
+    if shape is None:
+        return 0, 0
+    if not isinstance(shape, Shape):
+        return None, None
+    return len(shape.faces()), len(shape.edges())
+
+
+def _builder_shape() -> Any:
+    from build123d.build_common import Builder
+
+    builder = Builder._get_context(log=False)
+    return None if builder is None else builder._obj
+
+
+@dataclass
+class Event:
+    name: str
+    category: str
+    start: float
+    duration: float
+    rss_delta: int
+    counts_before: Tuple[Optional[int], Optional[int]]
+    counts_after: Tuple[Optional[int], Optional[int]]
+    thread: int = field(default_factory=threading.get_ident)
+
+
+class Profiler:
+    def __init__(self):
+        self.events: List[Event] = []
+        self._origin = time.perf_counter()
+        self._patches: List[Tuple[Any, str, Any]] = []
+
+    @contextmanager
+    def record(self, name: str, category: str, counted: Optional[Callable[[], Any]] = None) -> Iterator[None]:
+        """Record the enclosed block; ``counted`` returns the shape whose faces and edges are counted."""
+        counts_before = (None, None) if counted is None else _counts(counted())
+        rss_before = peak_rss()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.events.append(Event(
+                name, category, start - self._origin, duration,
+                peak_rss() - rss_before, counts_before, (None, None) if counted is None else _counts(counted()),
+            ))
+
+    def _wrap_operation(self, name: str, function: Callable[..., Any]) -> Callable[..., Any]:
+        def wrapper(*args, **kwargs):
+            if name in ("export_stl", "show"):
+                counted = lambda: args[0] if args else None
+            else:
+                counted = _builder_shape
+            with self.record(name, "operation", counted):
+                return function(*args, **kwargs)
+
+        wrapper.__wrapped__ = function
+        wrapper.__name__ = function.__name__
+        wrapper.__doc__ = function.__doc__
+        return wrapper
+
+    def _wrap_builders(self):
+        # Builder.__enter__ compares its caller's frame with the parent
+        # builder's, so it can't be wrapped. The scope it activates spans
+        # the whole with block instead.
+        from build123d import build_common
+
+        build_scope_context = build_common._build_scope_context
+
+        @contextmanager
+        def wrapper(scope):
+            builder = scope.owner
+            if type(builder).__name__ not in BUILDERS:
+                with build_scope_context(scope) as entered:
+                    yield entered
+                return
+            with self.record(type(builder).__name__, "builder", lambda: builder._obj):
+                with build_scope_context(scope) as entered:
+                    yield entered
+
+        self._patch(build_common, "_build_scope_context", wrapper)
+
+    def _patch(self, owner: Any, name: str, value: Any):
+        self._patches.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, value)
+
+    def _patch_everywhere(self, module: Any, name: str):
+        """Replace the function in its module and in every module that imported it by name."""
+        original = getattr(module, name)
+        wrapper = self._wrap_operation(name, original)
+        for other in list(sys.modules.values()):
+            if getattr(other, name, None) is original:
+                self._patch(other, name, wrapper)
+
+    def __enter__(self) -> "Profiler":
+        global _active
+        import build123d
+
+        for name in OPERATIONS:
+            self._patch_everywhere(build123d, name)
+        self._wrap_builders()
+        if "ocp_vscode" in sys.modules:
+            self._patch_everywhere(sys.modules["ocp_vscode"], "show")
+        _active = self
+        return self
+
+    def __exit__(self, *exception):
+        global _active
+        _active = None
+        while self._patches:
+            owner, name, original = self._patches.pop()
+            setattr(owner, name, original)
+
+    def trace(self) -> Dict[str, Any]:
+        """The events in Chrome's trace event format."""
+        pid = os.getpid()
+        events = []
+        for event in self.events:
+            args: Dict[str, Any] = {"peak_rss_delta_bytes": event.rss_delta}
+            for when, (faces, edges) in (("before", event.counts_before), ("after", event.counts_after)):
+                if faces is not None:
+                    args[f"faces_{when}"] = faces
+                    args[f"edges_{when}"] = edges
+            events.append({
+                "name": event.name,
+                "cat": event.category,
+                "ph": "X",
+                "ts": event.start * 1e6,
+                "dur": event.duration * 1e6,
+                "pid": pid,
+                "tid": event.thread,
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path: Union[str, Path]):
+        Path(path).write_text(json.dumps(self.trace()))
+
+    def summary(self) -> str:
+        """One line per event name, the slowest first.
+
+        The times of builders and features include those of the operations
+        inside them.
+        """
+        totals: Dict[Tuple[str, str], List[Event]] = {}
+        for event in self.events:
+            totals.setdefault((event.category, event.name), []).append(event)
+
+        def faces_delta(events: List[Event]) -> str:
+            deltas = [
+                event.counts_after[0] - event.counts_before[0]
+                for event in events
+                if event.counts_before[0] is not None and event.counts_after[0] is not None
+            ]
+            return f"{sum(deltas):+d}" if deltas else ""
+
+        lines = [f"{'name':<32} {'category':<10} {'calls':>6} {'total s':>9} {'mean s':>9} {'max s':>9} {'peak RSS MB':>11} {'faces':>7}"]
+        for (category, name), events in sorted(totals.items(), key=lambda item: -sum(e.duration for e in item[1])):
+            durations = [event.duration for event in events]
+            lines.append(
+                f"{name:<32} {category:<10} {len(events):>6} {sum(durations):>9.3f} "
+                f"{sum(durations) / len(durations):>9.3f} {max(durations):>9.3f} "
+                f"{sum(event.rss_delta for event in events) / 2**20:>11.1f} {faces_delta(events):>7}"
+            )
+        return "\n".join(lines)
+
+
+_active: Optional[Profiler] = None
+
+
+@contextmanager
+def span(name: str, category: str = "feature", counted: Optional[Callable[[], Any]] = None) -> Iterator[None]:
+    """Record the enclosed block in the active profiler, if there is one."""
+    if _active is None:
+        yield
+    else:
+        with _active.record(name, category, counted):
+            yield
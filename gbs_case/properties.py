@@ -0,0 +1,193 @@
+"""Mass properties and filament estimates of the parts, without a slicer.
+
+The properties are computed from the BREP with OCCT's GProps: volume,
+surface area, center of mass and the tight bounding box. The filament
+estimate assumes the part is printed solid, so it is an upper bound for
+prints with less than 100% infill.
+
+Computing the properties is done once per shape: they are cached by a hash
+of the part's BREP data, so every variant of a sweep that shares a part with
+another, or with an earlier run, costs a file hash. The shapes that aren't in
+the cache yet are computed in worker processes. Like :mod:`gbs_case.export`,
+this only needs OCP.
+"""
+
+import csv
+import hashlib
+import json
+import math
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from OCP.Bnd import Bnd_Box
+from OCP.BRepBndLib import BRepBndLib
+from OCP.BRepGProp import BRepGProp
+from OCP.GProp import GProp_GProps
+from OCP.TopoDS import TopoDS_Shape
+
+from .cache import PartCache
+from .files import atomic_write
+from .parameters import Filament, Parameters
+
+def mass_properties(shape: TopoDS_Shape) -> Dict[str, float]:
+    """Volume in mm³, area in mm², center of mass and bounding box in mm."""
+    volume = GProp_GProps()
+    BRepGProp.VolumeProperties_s(shape, volume)
+    surface = GProp_GProps()
+    BRepGProp.SurfaceProperties_s(shape, surface)
+    center = volume.CentreOfMass()
+    box = Bnd_Box()
+    # From the geometry rather than a mesh, and without the tolerance gap.
+    BRepBndLib.AddOptimal_s(shape, box, False, False)
+    low, high = box.CornerMin(), box.CornerMax()
+    return {
+        "volume": volume.Mass(),
+        "area": surface.Mass(),
+        "center_x": center.X(), "center_y": center.Y(), "center_z": center.Z(),
+        "min_x": low.X(), "min_y": low.Y(), "min_z": low.Z(),
+        "max_x": high.X(), "max_y": high.Y(), "max_z": high.Z(),
+        "size_x": high.X() - low.X(), "size_y": high.Y() - low.Y(), "size_z": high.Z() - low.Z(),
+    }
+
+
+def filament_estimate(volume: float, filament: Filament) -> Dict[str, float]:
+    """Grams and meters of filament for a solid print of ``volume`` mm³."""
+    return {
+        "filament_grams": volume / 1000 * filament.density,
+        "filament_meters": volume / (math.pi * (filament.diameter / 2) ** 2) / 1000,
+    }
+
+
+def _brep_properties(brep: Union[bytes, str]) -> Dict[str, float]:
+    from .export import read_brep
+
+    return mass_properties(read_brep(brep))
+
+
+class PropertiesCache:
+    """Mass properties by the SHA-256 of the BREP data they were computed from, in one JSON file."""
+
+    def __init__(self, path: Union[str, os.PathLike, None] = None):
+        self.path = PartCache().directory / "properties.json" if path is None else Path(path)
+        try:
+            self.entries: Dict[str, Dict[str, float]] = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def compute(self, breps: Dict[str, Union[bytes, Path]], jobs: Optional[int] = 1) -> Dict[str, Dict[str, float]]:
+        """Properties of each shape of ``breps``, which maps names to BREP data or files.
+
+        Shapes with the same BREP data are computed once.
+        """
+        hashes = {
+            name: hashlib.sha256(brep if isinstance(brep, bytes) else Path(brep).read_bytes()).hexdigest()
+            for name, brep in breps.items()
+        }
+        missing = {}
+        for name, digest in hashes.items():
+            if digest in self.entries:
+                self.hits += 1
+            elif digest not in missing:
+                self.misses += 1
+                missing[digest] = breps[name] if isinstance(breps[name], bytes) else os.fspath(breps[name])
+
+        if jobs == 1 or len(missing) < 2:
+            results = {digest: _brep_properties(brep) for digest, brep in missing.items()}
+        else:
+            from .parallel import pool
+
+            with pool(jobs or None) as executor:
+                futures = {digest: executor.submit(_brep_properties, brep) for digest, brep in missing.items()}
+                results = {digest: future.result() for digest, future in futures.items()}
+        self.entries.update(results)
+        if results:
+            self.save()
+        return {name: self.entries[digest] for name, digest in hashes.items()}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.path, json.dumps(self.entries, sort_keys=True))
+
+
+def _build(name: str, params: Parameters, cache: PartCache):
+    cache.build(name, params)
+
+
+def _cached_brep(name: str, params: Parameters, cache: PartCache) -> Union[bytes, Path]:
+    """The part's BREP file in the cache, or its data if the entry was evicted since it was built."""
+    path = cache.lookup(name, params)
+    if path is not None:
+        return path
+    from .brep import part_to_brep
+
+    return part_to_brep(cache.build(name, params))[0]
+
+
+def variant_properties(
+    grid: Dict[str, List[Any]],
+    parts: Sequence[str],
+    filament: Filament,
+    cache: Optional[PartCache] = None,
+    properties_cache: Optional[PropertiesCache] = None,
+    jobs: Optional[int] = 1,
+    base: Optional[Parameters] = None,
+) -> List[Dict[str, Any]]:
+    """One row of properties and filament estimates per variant of the grid and part.
+
+    The parts that aren't in the part cache are built first, each distinct
+    one once, on ``jobs`` worker processes.
+    """
+    from .sweep import variants
+
+    cache = PartCache() if cache is None else cache
+    properties_cache = PropertiesCache(cache.directory / "properties.json") if properties_cache is None else properties_cache
+
+    rows = []
+    tasks = {}
+    for label, values, params in variants(grid, base):
+        for name in parts:
+            row = {"variant": label, "part": name, **values}
+            if params is None:
+                rows.append({**row, "status": "invalid"})
+                continue
+            key = cache.key(name, params)
+            if cache.lookup(name, params) is None:
+                tasks.setdefault(key, (name, params))
+            rows.append({**row, "status": "ok", "key": key, "params": params})
+
+    if jobs == 1 or len(tasks) < 2:
+        for name, params in tasks.values():
+            cache.build(name, params)
+    else:
+        from .parallel import pool
+
+        # Imported before forking, so that the workers don't each import it.
+        import build123d
+
+        with pool(jobs or None) as executor:
+            for future in [executor.submit(_build, name, params, cache) for name, params in tasks.values()]:
+                future.result()
+
+    breps = {}
+    for row in rows:
+        if row["status"] == "ok" and row["key"] not in breps:
+            breps[row["key"]] = _cached_brep(row["part"], row["params"], cache)
+    properties = properties_cache.compute(breps, jobs)
+    for row in rows:
+        row.pop("params", None)
+        key = row.pop("key", None)
+        if key is not None:
+            row.update(properties[key])
+            row.update(filament_estimate(properties[key]["volume"], filament))
+    return rows
+
+
+def write_csv(rows: List[Dict[str, Any]], path: Union[str, os.PathLike]):
+    columns = list(dict.fromkeys(name for row in rows for name in row))
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
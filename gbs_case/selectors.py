@@ -0,0 +1,98 @@
+"""Memoized face selection for builders.
+
+The builders select faces by sorting and filtering the same unchanged part
+over and over, and every ``faces().sort_by(...)`` walks the topology and
+computes the centers again. :func:`face_index` returns an index of the
+builder's current part that does each selection only once. The index is
+thrown away as soon as the builder's part changes.
+"""
+
+from typing import Callable, Dict, Hashable, Tuple
+from weakref import WeakKeyDictionary
+
+from build123d import *
+from build123d.build_common import Builder
+from build123d.topology import Shape
+
+# Named faces: side -> (axis to sort along, index of the outer face, axis to
+# sort the faces parallel to the side along when looking for the inner face)
+SIDES: Dict[str, Tuple[Axis, int, Axis]] = {
+    "front": (Axis.Y, 0, Axis.Y),
+    "back": (Axis.Y, -1, -Axis.Y),
+    "left": (Axis.X, 0, Axis.X),
+    "right": (Axis.X, -1, -Axis.X),
+    "bottom": (Axis.Z, 0, Axis.Z),
+    "top": (Axis.Z, -1, -Axis.Z),
+}
+
+
+class SelectorIndex:
+    """Selections of a fixed list of shapes, each computed on first use."""
+
+    def __init__(self, shapes: ShapeList):
+        self.shapes = shapes
+        self._memo: Dict[Hashable, object] = {}
+
+    def _memoized(self, key: Hashable, select: Callable[[], object]):
+        try:
+            return self._memo[key]
+        except KeyError:
+            result = self._memo[key] = select()
+            return result
+
+    def sorted(self, axis: Axis) -> ShapeList:
+        """Same as ``shapes.sort_by(axis)``."""
+        return self._memoized(("sorted", axis), lambda: self.shapes.sort_by(axis))
+
+    def parallel(self, axis: Axis) -> ShapeList:
+        """Same as ``shapes.filter_by(axis)``."""
+        return self._memoized(("parallel", axis), lambda: self.shapes.filter_by(axis))
+
+    def parallel_sorted(self, axis: Axis, sort_axis: Axis) -> ShapeList:
+        """Same as ``shapes.filter_by(axis).sort_by(sort_axis)``."""
+        return self._memoized(("parallel_sorted", axis, sort_axis), lambda: self.parallel(axis).sort_by(sort_axis))
+
+
+class FaceIndex(SelectorIndex):
+    def outer(self, side: str) -> Face:
+        """The outermost face on the given side, e.g. ``outer("front")``."""
+        axis, position, _ = SIDES[side]
+        return self.sorted(axis)[position]
+
+    def inner(self, side: str) -> Face:
+        """The second face facing the given side, like the inner face of a wall."""
+        axis, _, sort_axis = SIDES[side]
+        return self.parallel_sorted(axis, sort_axis)[1]
+
+    def __getitem__(self, name: str) -> Face:
+        """Face by name, e.g. ``"front outer wall"`` or ``"left inner wall"``."""
+        return self._memoized(("name", name), lambda: self._named(name))
+
+    def _named(self, name: str) -> Face:
+        side, kind, *_ = name.split()
+        if kind == "outer":
+            return self.outer(side)
+        if kind == "inner":
+            return self.inner(side)
+        raise KeyError(name)
+
+
+_face_indexes: "WeakKeyDictionary[Builder, Tuple[object, FaceIndex]]" = WeakKeyDictionary()
+
+
+def _index(indexes: WeakKeyDictionary, builder: Builder, make: Callable[[Shape], SelectorIndex]):
+    # Builders replace _obj with a new shape on every operation and
+    # Builder.faces() reads it too, so its identity tells if the index is
+    # still valid.
+    obj = builder._obj
+    cached = indexes.get(builder)
+    if cached is not None and cached[0] is obj:
+        return cached[1]
+    index = make(obj)
+    indexes[builder] = (obj, index)
+    return index
+
+
+def face_index(builder: Builder) -> FaceIndex:
+    """Index of the faces of the builder's current object."""
+    return _index(_face_indexes, builder, lambda obj: FaceIndex(obj.faces()))
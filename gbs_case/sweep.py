@@ -0,0 +1,183 @@
+"""Parameter sweeps: build and export many variants of the case at once.
+
+A sweep takes a grid of parameter values and builds every combination. Each
+distinct part is only built once: variants whose parts share the same inputs
+(see :data:`~gbs_case.parameters.PART_INPUTS`) reuse them, so e.g. ``pcb``
+and ``hdmi_holder`` are built once no matter how many lid gaps are swept.
+Builds run on a pool of worker processes and go through the part cache.
+With ``lean``, each build releases everything but the finished part, so that
+the memory of a process stays flat over any number of variants, and reports
+its peak memory (see :mod:`gbs_case.memory`).
+"""
+
+import csv
+import dataclasses
+import itertools
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .cache import PartCache
+from .parameters import ClearanceGap, Parameters
+
+Grid = Dict[str, List[Any]]
+
+
+def parse_value(params: Parameters, name: str, text: str) -> Any:
+    """Convert ``text`` to the type of the parameter ``name``.
+
+    Gaps also accept the names of the :class:`ClearanceGap` presets.
+    """
+    current = get_value(params, name)
+    if isinstance(current, bool):
+        if text.lower() not in ("true", "false", "1", "0", "yes", "no"):
+            raise ValueError(f"{name} must be true or false, not {text!r}")
+        return text.lower() in ("true", "1", "yes")
+    if isinstance(current, (int, float)):
+        if name.endswith("_gap") and hasattr(ClearanceGap, text):
+            return getattr(ClearanceGap, text)
+        return float(text)
+    raise ValueError(f"{name} can't be swept from the command line")
+
+
+def get_value(params: Any, name: str) -> Any:
+    for attribute in name.split("."):
+        params = getattr(params, attribute)
+    return params
+
+
+def with_value(params: Any, name: str, value: Any) -> Any:
+    """Copy of ``params`` with the (possibly dotted, e.g. ``pcb.thickness``) field set."""
+    head, _, rest = name.partition(".")
+    if rest:
+        value = with_value(getattr(params, head), rest, value)
+    return dataclasses.replace(params, **{head: value})
+
+
+def variants(grid: Grid, base: Optional[Parameters] = None) -> List[Tuple[str, Dict[str, Any], Optional[Parameters]]]:
+    """Every combination of the grid as (label, values, parameters).
+
+    The parameters are None for combinations that aren't valid.
+    """
+    base = Parameters() if base is None else base
+    names = list(grid)
+    result = []
+    for combination in itertools.product(*(grid[name] for name in names)):
+        values = dict(zip(names, combination))
+        label = "__".join(f"{name}={value:g}" if isinstance(value, float) else f"{name}={value}" for name, value in values.items())
+        params = base
+        try:
+            for name, value in values.items():
+                params = with_value(params, name, value)
+        except AssertionError:
+            params = None
+        result.append((label or "default", values, params))
+    return result
+
+
+def _build_and_export(
+    name: str, params: Parameters, cache: Optional[PartCache], path: Path, lean: bool = False,
+) -> Dict[str, Any]:
+    """Build (or load) one part and write its STL. Runs in a worker."""
+    from .export import write_stl
+    from .factory import build_part
+
+    misses = cache.misses if cache is not None else 0
+    memory = {}
+    if lean:
+        from .memory import lean_build
+
+        part, usage = lean_build(name, params, cache)
+        seconds = usage.seconds
+        memory = {"peak_rss_mb": round(usage.peak_rss / 2**20, 1), "rss_mb": round(usage.rss / 2**20, 1)}
+    else:
+        start = time.perf_counter()
+        part = build_part(name, params, cache)
+        seconds = time.perf_counter() - start
+    status = "built" if cache is None or cache.misses > misses else "cached"
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_stl(part.wrapped, path)
+    size = part.bounding_box().size
+    return {
+        "status": status,
+        "build_seconds": round(seconds, 4),
+        "volume": round(part.volume, 3),
+        "size_x": round(size.X, 3),
+        "size_y": round(size.Y, 3),
+        "size_z": round(size.Z, 3),
+        **memory,
+    }
+
+
+def run(
+    grid: Grid,
+    out: Path,
+    parts: Sequence[str],
+    cache: Optional[PartCache] = None,
+    jobs: Optional[int] = 1,
+    base: Optional[Parameters] = None,
+    lean: bool = False,
+) -> List[Dict[str, Any]]:
+    """Build every variant of the grid and write ``out/<variant>/<part>.stl``.
+
+    Also writes ``out/summary.csv`` with one row per variant and part, and
+    returns the rows.
+    """
+    from .parallel import pool
+
+    cache = PartCache() if cache is None else cache
+    out.mkdir(parents=True, exist_ok=True)
+
+    # Each distinct part is built once, by the first variant that needs it.
+    tasks: Dict[str, Tuple[str, Parameters, Path]] = {}
+    rows = []
+    for label, values, params in variants(grid, base):
+        for name in parts:
+            row = {"variant": label, "part": name, **values}
+            if params is None:
+                rows.append({**row, "status": "invalid"})
+                continue
+            key = cache.key(name, params)
+            path = out / label / f"{name}.stl"
+            tasks.setdefault(key, (name, params, path))
+            rows.append({**row, "key": key, "file": str(path)})
+
+    if jobs == 1:
+        results = {
+            key: _build_and_export(name, params, cache, path, lean)
+            for key, (name, params, path) in tasks.items()
+        }
+    else:
+        # Imported before forking, so that the workers don't each import it.
+        import build123d
+
+        with pool(jobs or None) as executor:
+            futures = {
+                key: executor.submit(_build_and_export, name, params, cache, path, lean)
+                for key, (name, params, path) in tasks.items()
+            }
+            results = {key: future.result() for key, future in futures.items()}
+
+    for row in rows:
+        key = row.pop("key", None)
+        if key is None:
+            continue
+        row.update(results[key])
+        source = tasks[key][2]
+        if Path(row["file"]) != source:
+            row["status"] = "reused"
+            row["build_seconds"] = 0.0
+            Path(row["file"]).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(source, row["file"])
+
+    columns = ["variant", "part", *grid, "status", "build_seconds", "volume", "size_x", "size_y", "size_z"]
+    if lean:
+        columns += ["peak_rss_mb", "rss_mb"]
+    columns.append("file")
+    with open(out / "summary.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
@@ -0,0 +1,63 @@
+"""Feature templates: solids that are built once and placed many times.
+
+A template is a solid in its own local coordinates, with the XY plane as the
+face it stands on or is cut into. It is built the first time a set of
+dimensions asks for it, and placed with :func:`place`: every placement is the
+template moved, which shares the template's underlying geometry, so N
+pillars cost one pillar and N locations. The placements are fused with, or
+cut from, the part in one boolean operation, like the vent tools of
+:mod:`gbs_case.vents`.
+"""
+
+from functools import lru_cache
+from typing import Iterable, List
+
+from build123d import *
+
+
+@lru_cache(maxsize=None)
+def hole(radius: float, depth: float) -> Solid:
+    """Tool for a round hole, ``depth`` deep below the XY plane."""
+    return Solid.make_cylinder(radius, depth, Plane.XY.offset(-depth))
+
+
+@lru_cache(maxsize=None)
+def pillar(radius: float, hole_radius: float, height: float) -> Solid:
+    """A pillar with a screw hole through it, standing on the XY plane."""
+    return Solid.make_cylinder(radius, height) - Solid.make_cylinder(hole_radius, height)
+
+
+@lru_cache(maxsize=None)
+def pad(width: float, height: float, depth: float) -> Solid:
+    """Tool for a rectangular recess, ``depth`` deep below the XY plane."""
+    return Solid.make_box(width, height, depth, Plane((-width / 2, -height / 2, -depth)))
+
+
+@lru_cache(maxsize=None)
+def nob(width: float, height: float, extrusion: float, chamfer_length: float) -> Solid:
+    """A snap nob standing on the XY plane, its outer edges chamfered."""
+    with BuildPart() as nob_bp:
+        Box(width, height, extrusion, align=(Align.CENTER, Align.CENTER, Align.MIN))
+        chamfer(nob_bp.faces().sort_by(Axis.Z)[-1].edges(), length=chamfer_length, angle=45)
+    return nob_bp.part.solid()
+
+
+@lru_cache(maxsize=None)
+def tapered_pad(width: float, height: float, depth: float, taper: float) -> Solid:
+    """Tool for a rectangular recess whose sides lean in by ``taper`` degrees, ``depth`` deep below the XY plane."""
+    with BuildPart() as pad_bp:
+        with BuildSketch():
+            Rectangle(width, height)
+        extrude(amount=-depth, taper=taper)
+    return pad_bp.part.solid()
+
+
+def place(template: Solid, locations: Iterable[Location]) -> List[Solid]:
+    """The template moved to each of the locations."""
+    return [template.moved(location) for location in locations]
+
+
+def clear():
+    """Forget the built templates."""
+    for template in (hole, pillar, pad, nob, tapered_pad):
+        template.cache_clear()
@@ -0,0 +1,111 @@
+"""Ventilation hole patterns.
+
+A pattern is laid out over a rectangular area of a wall or of the top cover.
+Holes that would come too close to an obstacle (a port cutout, a pillar, a
+joint, the lid's insert) are left out, using a uniform grid as a 2D spatial
+index so that the check stays cheap for hundreds of holes. All holes share
+one tool solid placed at different locations, and they are cut together
+with the part's other openings in one boolean operation.
+"""
+
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from build123d import *
+
+from .parameters import VentPattern
+
+# Axis aligned 2D box: (min x, min y, max x, max y)
+Box2D = Tuple[float, float, float, float]
+
+
+class SpatialGrid:
+    """Uniform grid of buckets over 2D boxes, for fast overlap queries."""
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[Box2D]] = defaultdict(list)
+
+    def _cells_of(self, box: Box2D) -> Iterable[Tuple[int, int]]:
+        x0, y0, x1, y1 = (math.floor(v / self.cell_size) for v in box)
+        for i in range(x0, x1 + 1):
+            for j in range(y0, y1 + 1):
+                yield i, j
+
+    def insert(self, box: Box2D):
+        for cell in self._cells_of(box):
+            self.cells[cell].append(box)
+
+    def overlaps(self, box: Box2D) -> bool:
+        x0, y0, x1, y1 = box
+        for cell in self._cells_of(box):
+            for ox0, oy0, ox1, oy1 in self.cells.get(cell, ()):
+                if x0 < ox1 and ox0 < x1 and y0 < oy1 and oy0 < y1:
+                    return True
+        return False
+
+
+def inflate(box: Box2D, amount: float) -> Box2D:
+    x0, y0, x1, y1 = box
+    return x0 - amount, y0 - amount, x1 + amount, y1 + amount
+
+
+def vent_positions(pattern: VentPattern, area: Box2D, obstacles: Iterable[Box2D]) -> List[Tuple[float, float]]:
+    """Centers of the holes that fit in ``area`` without hitting ``obstacles``.
+
+    The pattern is centered in the area. Every hole keeps ``pattern.margin``
+    of material to the edges of the area and to the obstacles.
+    """
+    half_x, half_y = (extent / 2 for extent in pattern.hole_extent)
+    x0, y0, x1, y1 = inflate(area, -pattern.margin)
+    x0, y0, x1, y1 = x0 + half_x, y0 + half_y, x1 - half_x, y1 - half_y
+    if x0 > x1 or y0 > y1:
+        return []
+
+    grid = SpatialGrid(cell_size=pattern.pitch * 2)
+    for obstacle in obstacles:
+        grid.insert(inflate(obstacle, pattern.margin))
+
+    rows = int((y1 - y0) / pattern.row_pitch) + 1
+    columns = int((x1 - x0) / pattern.pitch) + 1
+    start_x = (x0 + x1) / 2 - (columns - 1) * pattern.pitch / 2
+    start_y = (y0 + y1) / 2 - (rows - 1) * pattern.row_pitch / 2
+    positions = []
+    for row in range(rows):
+        y = start_y + row * pattern.row_pitch
+        # Every other row of a hex pattern is shifted by half a pitch.
+        shift = pattern.pitch / 2 if pattern.pattern == "hex" and row % 2 else 0
+        for column in range(columns):
+            x = start_x + column * pattern.pitch + shift
+            if x > x1 + 1e-9:
+                continue
+            if not grid.overlaps((x - half_x, y - half_y, x + half_x, y + half_y)):
+                positions.append((x, y))
+    return positions
+
+
+def _hole_face(pattern: VentPattern) -> Face:
+    radius = pattern.hole_width / 2
+    if pattern.hole == "circle":
+        return Face(Wire([Edge.make_circle(radius)]))
+    half = pattern.hole_length / 2 - radius
+    return Face(Wire([
+        Edge.make_line((-half, -radius), (half, -radius)),
+        Edge.make_three_point_arc((half, -radius), (half + radius, 0), (half, radius)),
+        Edge.make_line((half, radius), (-half, radius)),
+        Edge.make_three_point_arc((-half, radius), (-half - radius, 0), (-half, -radius)),
+    ]))
+
+
+def vent_tools(pattern: VentPattern, plane: Plane, positions: List[Tuple[float, float]], start: float, depth: float) -> List[Solid]:
+    """Tool solids for the holes, going ``depth`` along the plane's normal from ``start``.
+
+    Every tool is the same solid moved to its position, so they all share
+    the underlying geometry.
+    """
+    if not positions:
+        return []
+    hole = _hole_face(pattern)
+    tool = Solid.extrude(hole.moved(Pos(0, 0, start)), Vector(0, 0, depth))
+    return [tool.moved(plane.location * Pos(x, y)) for x, y in positions]
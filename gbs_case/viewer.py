@@ -0,0 +1,155 @@
+"""Showing parts in the OCP viewer without tessellating them again and again.
+
+ocp_vscode keeps the meshes it made in an in-memory LRU cache, keyed by a
+hash of the serialized shape and the tessellation settings, so within one
+Python session an unchanged part isn't tessellated twice. :class:`SceneViewer`
+builds on that:
+
+* the meshes are also kept on disk (:class:`TessellationCache`), so a fresh
+  kernel reads the meshes of the parts that didn't change instead of
+  tessellating them;
+* a show of exactly the scene that was shown last is skipped, nothing is sent
+  to the viewer;
+* otherwise the parts that changed since the last show are reported, and only
+  they are tessellated. The viewer's protocol has no partial updates, so the
+  scene is still sent as a whole;
+* ``lod="coarse"`` tessellates with far larger deviations, for quick previews
+  while iterating on a part.
+
+Usage, in place of ocp_vscode's ``show``::
+
+    show = SceneViewer(lod="coarse").show
+"""
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .files import atomic_write, evict
+
+LOD_PRESETS: Dict[str, Dict[str, float]] = {
+    # ocp_vscode's defaults
+    "fine": {"deviation": 0.1, "angular_tolerance": 0.2},
+    "coarse": {"deviation": 2.0, "angular_tolerance": 1.0},
+}
+
+
+class TessellationCache:
+    """ocp_tessellate's in-memory mesh cache, mirrored to a directory.
+
+    One pickle file per mesh, named after a hash of the cache's key. The
+    least recently used files are removed when the directory grows beyond
+    ``max_size`` bytes.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_size: int = 512 * 2**20):
+        if directory is None:
+            from .cache import PartCache
+
+            directory = PartCache().directory / "tessellation"
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.saved: set = set()
+
+    def _path(self, key: Tuple) -> Path:
+        return self.directory / f"{hashlib.sha256(repr(key).encode()).hexdigest()}.pickle"
+
+    def install(self):
+        """Have ocp_tessellate's cache look a mesh up on disk when it doesn't have it.
+
+        Meshes are read one at a time, as the viewer asks for them, so
+        starting a session doesn't read the whole directory.
+        """
+        from ocp_tessellate.tessellator import cache
+
+        cache.__missing__ = self._missing
+
+    def _missing(self, key: Tuple) -> Any:
+        from ocp_tessellate.tessellator import cache
+
+        path = self._path(key)
+        try:
+            stored_key, mesh = pickle.loads(path.read_bytes())
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            raise KeyError(key) from None
+        # A hash collision, or a file that was put there by hand.
+        if stored_key != key:
+            raise KeyError(key)
+        os.utime(path)
+        cache[key] = mesh
+        self.saved.add(key)
+        return mesh
+
+    def save(self) -> int:
+        """Write the meshes of ocp_tessellate's cache that aren't on disk yet, return how many."""
+        from ocp_tessellate.tessellator import cache
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        written = 0
+        for key, mesh in list(cache.items()):
+            path = self._path(key)
+            if key in self.saved:
+                if path.exists():
+                    os.utime(path)
+                continue
+            atomic_write(path, pickle.dumps((key, mesh), protocol=pickle.HIGHEST_PROTOCOL))
+            self.saved.add(key)
+            written += 1
+        self.evict()
+        return written
+
+    def evict(self):
+        evict(([path] for path in self.directory.glob("*.pickle")), self.max_size)
+
+
+def scene_parts(objects: Tuple[Any, ...]) -> Dict[str, str]:
+    """Name -> hash of every shape that will be tessellated, assemblies by their leaves."""
+    from build123d import Shape
+    from ocp_tessellate.convert import create_cache_id
+
+    parts: Dict[str, str] = {}
+    for index, obj in enumerate(objects):
+        if not isinstance(obj, Shape):
+            parts[f"#{index}"] = repr(obj)
+            continue
+        leaves = obj.leaves if obj.children else (obj,)
+        for leaf in leaves:
+            name = leaf.label or f"#{index}"
+            while name in parts:
+                name += "'"
+            parts[name] = create_cache_id(leaf)
+    return parts
+
+
+class SceneViewer:
+    def __init__(self, lod: str = "fine", cache: Optional[TessellationCache] = None):
+        assert lod in LOD_PRESETS, lod
+        self.lod = lod
+        self.cache = TessellationCache() if cache is None else cache
+        self.cache.install()
+        self._last_scene: Optional[Tuple[Dict[str, str], str]] = None
+        self._last_parts: Dict[str, str] = {}
+
+    def show(self, *objects, lod: Optional[str] = None, **kwargs):
+        """ocp_vscode's ``show``, skipped when the scene didn't change since the last call."""
+        from ocp_vscode import show
+
+        settings = dict(LOD_PRESETS[lod or self.lod])
+        settings.update(kwargs)
+
+        parts = scene_parts(objects)
+        scene = (parts, repr(sorted(settings.items(), key=lambda item: item[0])))
+        if scene == self._last_scene:
+            print("show: nothing changed, not sent")
+            return None
+
+        changed: List[str] = [name for name, key in parts.items() if self._last_parts.get(name) != key]
+        if self._last_parts:
+            print(f"show: {len(changed)} of {len(parts)} parts changed: {', '.join(changed) or '-'}")
+        result = show(*objects, **settings)
+        self._last_scene = scene
+        self._last_parts.update(parts)
+        self.cache.save()
+        return result
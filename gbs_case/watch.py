@@ -0,0 +1,196 @@
+"""Re-running the changed cells of a script whenever it is saved.
+
+The script is split into cells at its ``# %%`` lines, like the editors do.
+:class:`CellRunner` keeps one namespace for all the cells, in this process,
+so build123d and OCP are imported once and the earlier cells' results stay
+in memory. After a save, only the cells whose source changed are run again,
+and the cells after them that read a name one of the re-run cells assigns.
+A cell with a star import (``from build123d import *``) may define any name,
+so all the cells after it depend on it.
+
+A change to the gbs_case package itself, like the parameters' defaults,
+drops its modules, so that they are imported again, and runs every cell.
+That drops the feature graphs' memos too, but the parts come from the part
+cache the script passes to the factories: a part whose inputs and builder
+source didn't change is loaded, not built. Changing a default in
+parameters.py only rebuilds the parts that have the parameter among their
+inputs (see :meth:`~gbs_case.parameters.Parameters.inputs_of`).
+
+After every run, the features of the case and top cover that were reused
+from the memos or computed are listed.
+"""
+
+import ast
+import sys
+import time
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+PACKAGE_DIRECTORY = Path(__file__).resolve().parent
+
+
+@dataclass
+class Cell:
+    source: str
+    # First line of the cell in the script, from 1.
+    line: int
+    reads: Set[str] = field(default_factory=set)
+    assigns: Set[str] = field(default_factory=set)
+    star_import: bool = False
+
+    @property
+    def title(self) -> str:
+        for line in self.source.splitlines():
+            line = line.strip().lstrip("#").strip()
+            if line and line != "%%":
+                return line[:60]
+        return "(empty)"
+
+
+def split_cells(text: str) -> List[Cell]:
+    """The cells of a script, each with the names it reads and assigns."""
+    cells = []
+    lines = text.splitlines(keepends=True)
+    start = 0
+    for index, line in enumerate(lines + ["# %%"]):
+        if line.startswith("# %%"):
+            if index > start:
+                cells.append(Cell("".join(lines[start:index]), start + 1))
+            start = index
+    for cell in cells:
+        try:
+            tree = ast.parse(cell.source)
+        except SyntaxError:
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name):
+                (cell.reads if isinstance(node.ctx, ast.Load) else cell.assigns).add(node.id)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                cell.assigns.add(node.name)
+            elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                for alias in node.names:
+                    if alias.name == "*":
+                        cell.star_import = True
+                    else:
+                        cell.assigns.add(alias.asname or alias.name.split(".")[0])
+    return cells
+
+
+def dirty_cells(cells: List[Cell], changed: Set[int]) -> List[int]:
+    """The changed cells and, transitively, the later cells that read what they assign."""
+    dirty: List[int] = []
+    assigned: Set[str] = set()
+    star_import = False
+    for index, cell in enumerate(cells):
+        if index in changed or star_import or cell.reads & assigned:
+            dirty.append(index)
+            assigned |= cell.assigns
+            star_import = star_import or cell.star_import
+    return dirty
+
+
+def reload_package():
+    """Drop the gbs_case modules, except this one, so that they are imported again."""
+    for name in list(sys.modules):
+        if (name == "gbs_case" or name.startswith("gbs_case.")) and name != __name__:
+            del sys.modules[name]
+
+
+class CellRunner:
+    def __init__(self, script: Path):
+        self.script = Path(script)
+        self.namespace: Dict[str, object] = {}
+        self.cells: List[Cell] = []
+        # Cells that failed, or weren't run because an earlier one failed.
+        self.pending: Set[int] = set()
+
+    def _fresh_namespace(self):
+        self.namespace = {"__name__": "__main__", "__file__": str(self.script.resolve())}
+
+    def _run_cell(self, index: int) -> bool:
+        cell = self.cells[index]
+        try:
+            # Padded, so that the line numbers are the script's.
+            code = compile("\n" * (cell.line - 1) + cell.source, str(self.script), "exec")
+            exec(code, self.namespace)
+        except Exception:
+            traceback.print_exc()
+            return False
+        return True
+
+    def update(self, package_changed: bool = False) -> List[int]:
+        """Run the cells that changed since the last update, return which ran."""
+        cells = split_cells(self.script.read_text())
+        if package_changed or not self.namespace:
+            reload_package()
+            self._fresh_namespace()
+            changed = set(range(len(cells)))
+        else:
+            changed = {
+                index for index, cell in enumerate(cells)
+                if index >= len(self.cells) or cell.source != self.cells[index].source
+            }
+            changed |= {index for index in self.pending if index < len(cells)}
+        self.cells = cells
+
+        dirty = dirty_cells(cells, changed)
+        self.pending = set()
+        ran = []
+        for position, index in enumerate(dirty):
+            start = time.perf_counter()
+            ok = self._run_cell(index)
+            print(f"cell {index + 1} ({cells[index].title}): {time.perf_counter() - start:.2f} s{'' if ok else ', failed'}")
+            if not ok:
+                self.pending = set(dirty[position:])
+                break
+            ran.append(index)
+        return ran
+
+
+def feature_report() -> List[str]:
+    """The parts' feature report since the last one, if the script built parts."""
+    # Not imported here, that would import build123d for any script.
+    parts = sys.modules.get("gbs_case.parts")
+    return parts.feature_report() if parts is not None else []
+
+
+def _mtimes(paths: List[Path]) -> Dict[Path, float]:
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = path.stat().st_mtime
+        except OSError:
+            pass
+    return mtimes
+
+
+def watch(script: Path, interval: float = 0.25, runner: Optional[CellRunner] = None):
+    """Run the script, then run its changed cells on every save, until interrupted."""
+    runner = CellRunner(script) if runner is None else runner
+    script = Path(script)
+
+    def package_files() -> List[Path]:
+        return sorted(PACKAGE_DIRECTORY.glob("*.py"))
+
+    start = time.perf_counter()
+    runner.update()
+    print(f"ran {script} in {time.perf_counter() - start:.2f} s, watching for changes")
+    for line in feature_report():
+        print(f"  {line}")
+    seen = _mtimes([script] + package_files())
+    while True:
+        time.sleep(interval)
+        mtimes = _mtimes([script] + package_files())
+        if mtimes == seen:
+            continue
+        package_changed = any(
+            mtimes.get(path) != seen.get(path) for path in set(mtimes) | set(seen) if path != script
+        )
+        seen = mtimes
+        start = time.perf_counter()
+        ran = runner.update(package_changed)
+        print(f"{len(ran)} of {len(runner.cells)} cells run in {time.perf_counter() - start:.2f} s")
+        for line in feature_report():
+            print(f"  {line}")
@@ -0,0 +1,70 @@
+"""Shared fixtures: the parts of each golden variant, built once per session.
+
+``--exact`` also runs the tests marked ``exact``, which compare the parts
+with the golden BREP files. ``--update-golden`` records the current parts as
+the golden ones instead of comparing them.
+"""
+
+import pytest
+
+from gbs_case.factory import build_part
+from gbs_case.golden import GoldenStore
+from gbs_case.parts import PART_BUILDERS
+
+from .variants import VARIANTS
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--exact", action="store_true", help="also compare the parts with the golden BREP files, by boolean differences",
+    )
+    parser.addoption(
+        "--update-golden", action="store_true", help="record the current parts as the golden ones; with --exact their BREP files too",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "exact: slow comparison with the golden BREP files, run with --exact")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--exact"):
+        return
+    skip = pytest.mark.skip(reason="needs --exact")
+    for item in items:
+        if "exact" in item.keywords:
+            item.add_marker(skip)
+
+
+def _variant_parts(variant: str):
+    @pytest.fixture(scope="session")
+    def parts():
+        # Through the factories, so that a part whose inputs are the same in
+        # several variants is built once.
+        return {name: build_part(name, VARIANTS[variant]) for name in PART_BUILDERS}
+
+    return parts
+
+
+default_parts = _variant_parts("default")
+nob_parts = _variant_parts("nob")
+vents_parts = _variant_parts("vents")
+
+
+@pytest.fixture
+def variant_parts(request):
+    """The parts of a variant, by the variant's name."""
+    return lambda variant: request.getfixturevalue(f"{variant}_parts")
+
+
+@pytest.fixture(scope="session")
+def update_golden(pytestconfig) -> bool:
+    return pytestconfig.getoption("--update-golden")
+
+
+@pytest.fixture(scope="session")
+def golden_store(update_golden):
+    store = GoldenStore()
+    yield store
+    if update_golden:
+        store.save()
@@ -0,0 +1,38 @@
+"""Geometric regression tests against the golden fingerprints and BREP files."""
+
+import pytest
+
+from gbs_case.golden import differences, exact_difference, exact_variants, fingerprint
+from gbs_case.parts import PART_BUILDERS
+
+from .variants import ABS_TOLERANCE, REL_TOLERANCE, VARIANTS, VOLUME_TOLERANCE
+
+CASES = [(variant, name) for variant in VARIANTS for name in PART_BUILDERS]
+
+
+@pytest.mark.parametrize("variant, name", CASES, ids=[f"{variant}/{name}" for variant, name in CASES])
+def test_fingerprint(variant, name, variant_parts, golden_store, update_golden):
+    params = VARIANTS[variant]
+    current = fingerprint(name, variant_parts(variant)[name], params)
+    key = f"{variant}/{name}"
+    if update_golden:
+        golden_store.fingerprints[key] = current
+        return
+    assert key in golden_store.fingerprints, "no golden fingerprint, record one with --update-golden"
+    assert differences(golden_store.fingerprints[key], current, REL_TOLERANCE, ABS_TOLERANCE) == []
+
+
+EXACT_CASES = exact_variants(VARIANTS)
+
+
+@pytest.mark.exact
+@pytest.mark.parametrize("variant, name", EXACT_CASES, ids=[f"{variant}/{name}" for variant, name in EXACT_CASES])
+def test_exact(variant, name, variant_parts, golden_store, update_golden):
+    params = VARIANTS[variant]
+    part = variant_parts(variant)[name]
+    if update_golden:
+        golden_store.write_brep(name, params, part)
+        return
+    golden = golden_store.read_brep(name, params)
+    assert golden is not None, "no golden BREP file, record one with --update-golden --exact"
+    assert exact_difference(part, golden) <= VOLUME_TOLERANCE
@@ -0,0 +1,20 @@
+"""The parameter variants the golden tests cover, and their tolerances."""
+
+from gbs_case.parameters import Parameters, VentPattern
+
+VARIANTS = {
+    "default": Parameters(),
+    "nob": Parameters(use_nob=True),
+    # Few enough holes to keep the tests quick, on walls and on the lid.
+    "vents": Parameters(
+        use_nob=True,
+        case_vents=VentPattern(walls=("left", "right"), pitch=8, hole_width=4),
+        top_cover_vents=VentPattern(pattern="grid", hole="slot", pitch=16),
+    ),
+}
+
+# Relative tolerance, and the absolute one for values close to zero, in mm.
+REL_TOLERANCE = 1e-6
+ABS_TOLERANCE = 1e-4
+# Volume of the boolean differences, in mm³, that counts as no difference.
+VOLUME_TOLERANCE = 1e-3